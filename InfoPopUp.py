@@ -21,7 +21,7 @@
 # SOFTWARE.
 #
 
-from tkinter import Menu, Widget
+from tkinter import Menu, Widget, Misc
 from tkinter import RIGHT, DISABLED
 from tkinter.font import nametofont
 from typing import Iterable
@@ -30,6 +30,46 @@ from typing import Iterable
 __all__ = ["InfoPopUp"]
 
 
+# adds all menu entries with a single Tcl call; args: [<is line> <label>, ...]
+_ADD_ENTRIES = """{w compound font state args} {
+    foreach {is_line label} $args {
+        if {$is_line} {
+            $w add command -label $label -compound $compound -font $font -state $state
+        } else {
+            $w add separator
+        }
+    }
+}"""
+
+
+class _FocusTracker:
+    """Remembers the last focused widget of a toplevel; one instance is shared by all popups of the toplevel."""
+
+    __slots__ = ("last",)
+
+    def __init__(self, toplevel: Misc):
+        self.last: Misc | None = None
+        toplevel.bind("<FocusIn>", self._remember, add="+")
+        # a FocusIn follows if the focus stays in the application
+        toplevel.bind("<FocusOut>", self._forget, add="+")
+
+    @classmethod
+    def of(cls, widget: Misc) -> "_FocusTracker":
+        toplevel = widget.winfo_toplevel()
+        try:
+            return toplevel._info_popup_focus
+        except AttributeError:
+            tracker = toplevel._info_popup_focus = cls(toplevel)
+            return tracker
+
+    def _remember(self, e):
+        if isinstance(e.widget, Misc):
+            self.last = e.widget
+
+    def _forget(self, _):
+        self.last = None
+
+
 class InfoPopUp(Menu):
     def __init__(self,
                  target: Widget,
@@ -75,69 +115,84 @@ class InfoPopUp(Menu):
                       bd=0, activeborderwidth=0
                       )
 
+        entries = list()
         for _line in info_lines:
-            if _line is None:
-                self.add_separator()
-            else:
-                self.add_command(
-                    label=_line,
-                    compound=RIGHT,
-                    font=font,
-                    state=DISABLED
-                )
+            entries += ((0, "") if _line is None else (1, _line))
+        self.tk.call('apply', _ADD_ENTRIES, self._w, RIGHT, font, DISABLED, *entries)
 
         target.bind("<Enter>", self._popup)
         target.bind("<Leave>", self._clear)
-        target.bind("<Button>", lambda _: self.unpost())
-        self.bind("<Enter>", lambda _: self.focus.__setitem__(1, True))
+        # registered commands are bound without the event substitution
+        target.bind("<Button>", self.register(self.unpost))
+        self.bind("<Enter>", self.register(self._on_menu_enter))
         self.bind("<Leave>", self._upost)
-        self.focus = [False, False]
+        self._focus_target = False
+        self._focus_menu = False
         self.posted = False
+        self._popup_id = self._clear_id = self._upost_id = None
+        self._focus_tracker = _FocusTracker.of(target)
 
     def _suppress(self, _):
-        self.focus = [False, False]
+        self._focus_target = self._focus_menu = False
         self.posted = False
 
+    def _after(self, ms: int, func, pending_id: str | None = None) -> str:
+        # a still pending callback of the same kind is dropped
+        if pending_id is not None:
+            self.after_cancel(pending_id)
+        # zero delays are run from the idle queue instead of the timer queue
+        if ms:
+            return self.after(ms, func)
+        return self.after_idle(func)
+
+    def _on_menu_enter(self):
+        self._focus_menu = True
+
     def _clear(self, _):
-        self.focus[0] = False
+        self._focus_target = False
 
         def clear():
-            if True not in self.focus:
+            self._clear_id = None
+            if not (self._focus_target or self._focus_menu):
                 self.unpost()
                 self.posted = False
 
-        self.after(self.clear_timer, clear)
+        self._clear_id = self._after(self.clear_timer, clear, self._clear_id)
 
     def _popup(self, _):
-        self.focus[0] = True
+        self._focus_target = True
         if self.posted: return
 
         def popup():
-            if not self.focus[0]: return
+            self._popup_id = None
+            if not self._focus_target: return
             self.pre_pop_call()
-            wf = self.focus_get()
+            wf = self._focus_tracker.last
+            if wf is None or not wf.winfo_exists():
+                wf = self.focus_get()
             try:
                 self.tk_popup(
                     self.winfo_pointerx() + self.pop_pos[0],
                     self.winfo_pointery() + self.pop_pos[1])
             finally:
-                if wf: wf.focus_force()
+                if wf and wf is not self and wf.winfo_exists(): wf.focus_force()
                 self.grab_release()
                 self.posted = True
 
-        self.after(self.popup_timer, popup)
+        self._popup_id = self._after(self.popup_timer, popup, self._popup_id)
 
     def _upost(self, _):
-        self.focus[1] = False
-        if True in self.focus: return
+        self._focus_menu = False
+        if self._focus_target: return
 
         def upost():
+            self._upost_id = None
             try:
                 self.unpost()
             finally:
                 self.posted = False
 
-        self.after(self.unpost_timer, upost)
+        self._upost_id = self._after(self.unpost_timer, upost, self._upost_id)
 
 
 if __name__ == "__main__":
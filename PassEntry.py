@@ -30,6 +30,14 @@ from typing import Iterable
 __all__ = ["PassEntry"]
 
 
+# fixed-width encoding of the password buffer: one char == _CW bytes
+_CODEC = "utf-32-le"
+_CW = 4
+
+_DELBACK = frozenset(('Delete', 'BackSpace'))
+_MOUSE_NUMS = frozenset((1, 2, 3))
+
+
 class PassEntry(Entry):
 
     def __init__(self,
@@ -51,7 +59,7 @@ class PassEntry(Entry):
 
 
         howto get the password:
-            - by protected member self._password
+            - by protected member self._password (decoded from self._password_buf)
             - by calling self.getpass (args `getpass_*' executed here)
             - by calling self.get (args `getpass_*' executed here)
 
@@ -65,7 +73,7 @@ class PassEntry(Entry):
         :param tk_kwargs: Valid resource names: background, bd, bg, borderwidth, cursor, exportselection, fg, font, foreground, highlightbackground, highlightcolor, highlightthickness, insertbackground, insertborderwidth, insertofftime, insertontime, insertwidth, invalidcommand, invcmd, justify, relief, selectbackground, selectborderwidth, selectforeground, state, takefocus, textvariable, validate, validatecommand, vcmd, width, xscrollcommand
         """
 
-        self._password: str = ""
+        self._password_buf: bytearray = bytearray()
 
         self.delay: int = delay
         self.show: chr = show
@@ -75,10 +83,13 @@ class PassEntry(Entry):
         self.getpass_del: bool = getpass_del
 
         Entry.__init__(self, master, tk_kwargs)
+        self._tk_call = self.tk.call
+        self._wname: str = self._w
         self.bind("<Key>", self._run)
         self.bind("<Button>", self._run)
 
         self._external: bool = False
+        self._hide_after_id: str | None = None
 
         self.get = self.getpass
 
@@ -90,43 +101,43 @@ class PassEntry(Entry):
             # AltGr+Key(AT-Layout),         @ ł | ~
             # AltGr+Shift+Key(AT-Layout)    Ω Ł ÷ ⅜
             # )
-            self._states = (0, 16, 17, 144, 145)
+            self._states = frozenset((0, 16, 17, 144, 145))
         elif platform == "win32":
             # (
             # AltGr+Key(AT-Layout),         @ \ | }
             # NoModifier,                   a b c d
             # Shift+Key,                    A B C D
             # )
-            self._states = (0, 8, 9)
+            self._states = frozenset((0, 8, 9))
 
     def _char(self, event) -> str:
         def del_mkey():
             i = self.index(INSERT)
             self._delete(i - 1, i)
 
-        if event.keysym in ('Delete', 'BackSpace'):
+        keysym = event.keysym
+        char = event.char
+        if keysym in _DELBACK or event.num in _MOUSE_NUMS:
             return ""
-        elif event.keysym == "Multi_key" and len(event.char) == 2:  # windows stuff
-            if event.char[0] == event.char[1]:
+        elif keysym == "Multi_key" and len(char) == 2:  # windows stuff
+            if char[0] == char[1]:
                 self.after(10, del_mkey)
-                return event.char[0]
-            return event.char
-        elif event.char != '\\' and '\\' in f"{event.char=}":
+                return char[0]
+            return char
+        elif event.state not in self._states:
             return ""
-        elif event.num in (1, 2, 3):
+        elif not char.isprintable():  # control chars
             return ""
-        elif event.state in self._states:
-            return event.char
-        return ""
+        return char
 
     def _get(self):
-        return self.tk.call(self._w, 'get')
+        return self._tk_call(self._wname, 'get')
 
     def _delete(self, first, last=None):
-        self.tk.call(self._w, 'delete', first, last)
+        self._tk_call(self._wname, 'delete', first, last)
 
     def _insert(self, index, string: str) -> None:
-        self.tk.call(self._w, 'insert', index, string)
+        self._tk_call(self._wname, 'insert', index, string)
 
     def _run(self, event):
 
@@ -134,14 +145,10 @@ class PassEntry(Entry):
             self._external = False
             self.clear()
 
-        def hide(index: int, lchar: int):
-            i = self.index(INSERT)
-            for j in range(lchar):
-                self._delete(index + j, index + 1 + j)
-                self._insert(index + j, self.show)
-            self.icursor(i)
+        keysym = event.keysym
+        buf = self._password_buf
 
-        if event.keysym == 'Delete':
+        if keysym == 'Delete':
             if self.select_present():
                 start = self.index(SEL_FIRST)
                 end = self.index(SEL_LAST)
@@ -149,9 +156,9 @@ class PassEntry(Entry):
                 start = self.index(INSERT)
                 end = start + 1
 
-            self._password = self._password[:start] + self._password[end:]
+            del buf[start * _CW:end * _CW]
 
-        elif event.keysym == 'BackSpace':
+        elif keysym == 'BackSpace':
             if self.select_present():
                 start = self.index(SEL_FIRST)
                 end = self.index(SEL_LAST)
@@ -161,7 +168,7 @@ class PassEntry(Entry):
                 end = start
                 start -= 1
 
-            self._password = self._password[:start] + self._password[end:]
+            del buf[start * _CW:end * _CW]
 
         elif char := self._char(event):
             if self.select_present():
@@ -171,32 +178,53 @@ class PassEntry(Entry):
                 start = self.index(INSERT)
                 end = start
 
-            self._password = self._password[:start] + char + self._password[end:]
+            buf[start * _CW:end * _CW] = char.encode(_CODEC)
 
-            self.after(self.delay, hide, start, len(char))
+            # one pending hide for a burst of keystrokes (not restarted, no char stays visible longer than `delay`)
+            if self._hide_after_id is None:
+                self._hide_after_id = self.after(self.delay, self._flush_hide)
+
+    def _flush_hide(self):
+        self._hide_after_id = None
+        show = self.show
+        text = self._get()
+        first = len(text) - len(text.lstrip(show))
+        last = len(text.rstrip(show))
+        if first < last:
+            i = self.index(INSERT)
+            self._delete(first, last)
+            self._insert(first, show * (last - first))
+            self.icursor(i)
 
     def insert(self, index, string: str) -> None:
         self._external = True
-        self.tk.call(self._w, 'insert', index, string)
+        self._tk_call(self._wname, 'insert', index, string)
 
     def delete(self, first, last=None) -> None:
         self._external = True
-        self.tk.call(self._w, 'delete', first, last)
+        self._tk_call(self._wname, 'delete', first, last)
+
+    @property
+    def _password(self) -> str:
+        return self._password_buf.decode(_CODEC)
+
+    def _wipe(self):
+        # overwrite the plaintext before releasing it
+        self._password_buf[:] = bytes(len(self._password_buf))
+        del self._password_buf[:]
 
     def clear(self):
-        del self._password
-        self._password = ""
+        self._wipe()
         self._delete(0, END)
 
     def getpass(self):
         password = self._password
         if self.getpass_range:
-            assert len(self._password) in self.getpass_range, f'## Password not in {self.getpass_range}'
+            assert len(self._password_buf) // _CW in self.getpass_range, f'## Password not in {self.getpass_range}'
         if self.getpass_call:
-            password = self.getpass_call.__call__(self._password)
+            password = self.getpass_call.__call__(password)
         if self.getpass_del:
-            del self._password
-            self._password = ""
+            self._wipe()
             self._delete(0, END)
         return password
 
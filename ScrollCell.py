@@ -22,7 +22,7 @@
 #
 
 from tkinter import LabelFrame, Canvas, Scrollbar, Frame, Pack, Grid, Place, Widget
-from typing import Literal
+from typing import Literal, Callable
 
 
 __all__ = ["ScrollCell"]
@@ -33,12 +33,38 @@ V_EVENTS = ("<Next>", "<Prior>")
 h_EVENTS = ("<Control-Button-4>", "<Control-Button-5>", "<Control-MouseWheel>")
 H_EVENTS = ("<Control-Right>", "<Control-Left>")
 
-FACTORIZING_KEYSYM = ("Down", "Up", "Next", "Prior", "Right", "Left")
-INVERT_KEYSYM = ("Down", "Right", "Next")
+FACTORIZING_KEYSYM = frozenset(("Down", "Up", "Next", "Prior", "Right", "Left"))
+INVERT_KEYSYM = frozenset(("Down", "Right", "Next"))
+
+# geometry methods that are directed to the _container
+_GEO_METHS = tuple(
+    m for m in Pack.__dict__.keys() | Grid.__dict__.keys() | Place.__dict__.keys()
+    if not m.startswith('_') and m != 'config' and m != 'configure'
+)
 
 
 class ScrollCell(Frame):
 
+    v_EVENTS = v_EVENTS
+    V_EVENTS = V_EVENTS
+    h_EVENTS = h_EVENTS
+    H_EVENTS = H_EVENTS
+
+    FACTORIZING_KEYSYM = FACTORIZING_KEYSYM
+    INVERT_KEYSYM = INVERT_KEYSYM
+
+    # bind mode: ((<*_EVENTS attribute>, <handler attribute>), ...)
+    _BIND_MODS = {
+        "v": (("v_EVENTS", "_scroll_y"),),
+        "h": (("h_EVENTS", "_scroll_x"),),
+        "V": (("v_EVENTS", "_scroll_y"), ("V_EVENTS", "_scroll_y")),
+        "H": (("h_EVENTS", "_scroll_x"), ("H_EVENTS", "_scroll_x")),
+        "vh": (("v_EVENTS", "_scroll_y"), ("h_EVENTS", "_scroll_x")),
+        "vH": (("v_EVENTS", "_scroll_y"), ("h_EVENTS", "_scroll_x"), ("H_EVENTS", "_scroll_x")),
+        "Vh": (("v_EVENTS", "_scroll_y"), ("V_EVENTS", "_scroll_y"), ("h_EVENTS", "_scroll_x")),
+        "VH": (("v_EVENTS", "_scroll_y"), ("V_EVENTS", "_scroll_y"), ("h_EVENTS", "_scroll_x"), ("H_EVENTS", "_scroll_x")),
+    }
+
     def __init__(self,
                  master,
                  reverse_scroll: bool = True,
@@ -58,15 +84,15 @@ class ScrollCell(Frame):
           - Factorization for specific events (VH_factors)
           - Manual binding of events to widgets at a higher level (self.scroll_update)
 
-        Global variables (can be overwritten after initialization)
+        Class attributes (override them in a subclass, or on the instance followed by self.make_bind_table();
+        the *_EVENTS are read into the bind table at initialization, the *_KEYSYM are read per event)
           - v_EVENTS = ("<Button-4>", "<Button-5>", "<MouseWheel>")
           - V_EVENTS = ("<Next>", "<Prior>")
           - h_EVENTS = ("<Control-Button-4>", "<Control-Button-5>", "<Control-MouseWheel>")
           - H_EVENTS = ("<Control-Right>", "<Control-Left>")
 
-          - FACTORIZING_KEYSYM = ("Down", "Up", "Next", "Prior", "Right", "Left")
-          - INVERT_KEYSYM = ("Down", "Right", "Next")
-
+          - FACTORIZING_KEYSYM = frozenset(("Down", "Up", "Next", "Prior", "Right", "Left"))
+          - INVERT_KEYSYM = frozenset(("Down", "Right", "Next"))
 
         :param master: the master widget
         :param reverse_scroll: defines the trend
@@ -80,14 +106,6 @@ class ScrollCell(Frame):
         :param _front_kwargs: the kwargs of the scrollable part
         """
 
-        self.v_EVENTS = v_EVENTS
-        self.V_EVENTS = V_EVENTS
-        self.h_EVENTS = h_EVENTS
-        self.H_EVENTS = H_EVENTS
-
-        self.FACTORIZING_KEYSYM = FACTORIZING_KEYSYM
-        self.INVERT_KEYSYM = INVERT_KEYSYM
-
         self.trend: int = (-1 if reverse_scroll else 1)
         self.VH_factors: tuple = VH_factors
 
@@ -101,6 +119,13 @@ class ScrollCell(Frame):
         self.orient_gr_height = orient_gr_height
         self.auto_bind_mod = auto_bind_mod
 
+        self._pending_update = None
+        self._bound: set[tuple[str, str]] = set()
+        self._bound_children: set[str] = set()
+        self._last_expose: tuple[int, int, int] = (0, 0, 0)
+        self._bind_table: dict[str, tuple[tuple[str, Callable], ...]] = dict()
+        self.make_bind_table()
+
         # *--_container-------------------------------------------------(geometry managers are directed hereon)----*
         # | +-------------------cell--------------------------------------------------------------------------+*--*|
         # | |o---------------------------------------front--------------(self)-------------------------------o||S ||
@@ -144,6 +169,8 @@ class ScrollCell(Frame):
 
         self.cell = Canvas(self._container, **cell_kwargs)
         self.cell.pack(side="right")
+        self._xview_scroll = self.cell.xview_scroll
+        self._yview_scroll = self.cell.yview_scroll
 
         Frame.__init__(self, self.cell, **_front_kwargs)
 
@@ -170,62 +197,54 @@ class ScrollCell(Frame):
 
         # define the self geometry methods to those of the _container
 
-        for geo_meth in Pack.__dict__.keys() | Grid.__dict__.keys() | Place.__dict__.keys():
-            if not geo_meth.startswith('_') and geo_meth != 'config' and geo_meth != 'configure':
-                setattr(self, geo_meth, getattr(self._container, geo_meth))
-
-    def __orient_gr_width(self, *_):
-        def width():
-            return {
-                "sum": self.winfo_width,
-                "widget": max(self.winfo_children(), key=lambda w: w.winfo_width()).winfo_width
-            }[self.orient_gr_width]()
-
-        self.config_cell(
-            width=width()
-        )
+        for geo_meth in _GEO_METHS:
+            setattr(self, geo_meth, getattr(self._container, geo_meth))
 
-    def __orient_gr_height(self, *_):
-        def height():
-            return {
-                "sum": self.winfo_height,
-                "widget": max(self.winfo_children(), key=lambda w: w.winfo_height()).winfo_height
-            }[self.orient_gr_height]()
-
-        self.config_cell(
-            height=height()
-        )
+    def __orient_gr(self, dim: Literal["width", "height"], mode: Literal["sum", "widget"]):
+        winfo = "winfo_" + dim
+        if mode == "sum":
+            size = getattr(self, winfo)()
+        else:
+            size = max(getattr(w, winfo)() for w in self.winfo_children())
+        self.config_cell(**{dim: size})
 
     def __expose(self, *_):
+        children = self.winfo_children()
+        if self.auto_bind_mod:
+            for w in children:
+                if (name := str(w)) not in self._bound_children:
+                    self._bound_children.add(name)
+                    w.bind("<Destroy>", self.__forget_child, add="+")
+                # skipped while bound; rebinds after make_bind_table()
+                if (key := (name, self.auto_bind_mod)) not in self._bound:
+                    self._bound.add(key)
+                    self.scroll_update(w, self.auto_bind_mod)
+        if (geo := (self.winfo_width(), self.winfo_height(), len(children))) == self._last_expose:
+            return
+        self._last_expose = geo
         if self.orient_gr_width:
-            self.__orient_gr_width()
+            self.__orient_gr("width", self.orient_gr_width)
         if self.orient_gr_height:
-            self.__orient_gr_height()
-        if self.auto_bind_mod:
-            for w in self.winfo_children():
-                self.scroll_update(w, self.auto_bind_mod)
-
-    def __scroll_val(self, e, factor: int = 1) -> int:
-        u = self.trend
-        if e.num == 5 or e.delta < 0 or e.keysym in self.INVERT_KEYSYM: u = ~ u + 1
-        if e.keysym in self.FACTORIZING_KEYSYM: u *= factor
-        return u
+            self.__orient_gr("height", self.orient_gr_height)
 
-    def __scroll_x(self, e):
-        self.scroll_x(self.__scroll_val(e, self.VH_factors[0]))
+    def __forget_child(self, e):
+        name = str(e.widget)
+        self._bound_children.discard(name)
+        self._bound.difference_update([key for key in self._bound if key[0] == name])
 
-    def __scroll_y(self, e):
-        self.scroll_y(self.__scroll_val(e, self.VH_factors[1]))
+    def __scroll_val(self, e, factor: int = 1) -> int:
+        u = (-self.trend if e.num == 5 or e.delta < 0 or e.keysym in self.INVERT_KEYSYM else self.trend)
+        return (u * factor if e.keysym in self.FACTORIZING_KEYSYM else u)
 
     def _scroll_x(self, e):
         # This method is bound to the events
         # Additional code here (for inheritance)
-        self.__scroll_x(e)
+        self._xview_scroll(self.__scroll_val(e, self.VH_factors[0]), "units")
 
     def _scroll_y(self, e):
         # This method is bound to the events
         # Additional code here (for inheritance)
-        self.__scroll_y(e)
+        self._yview_scroll(self.__scroll_val(e, self.VH_factors[1]), "units")
 
     def scroll_x(self, z: int) -> None:
         self.cell.xview_scroll(z, "units")
@@ -243,25 +262,27 @@ class ScrollCell(Frame):
         :param __add_w: the target widget
         :param bind_mod: the bind mode
         """
-        vert = {event: self._scroll_y for event in self.v_EVENTS}
-        VERT = vert | {event: self._scroll_y for event in self.V_EVENTS}
-        hori = {event: self._scroll_x for event in self.h_EVENTS}
-        HORI = hori | {event: self._scroll_x for event in self.H_EVENTS}
-        _mod = {
-            "v": vert,
-            "h": hori,
-            "V": VERT,
-            "H": HORI,
-            "vh": vert | hori,
-            "vH": vert | HORI,
-            "Vh": VERT | hori,
-            "VH": VERT | HORI
-        }
-        for binding in _mod[bind_mod].items():
+        for binding in self._bind_table[bind_mod]:
             __add_w.bind(*binding)
 
+    def make_bind_table(self) -> None:
+        """
+        Create the table of (event, handler) pairs per bind mode from the *_EVENTS.
+        The table is created once at initialization.
+        """
+        self._bound.clear()
+        self._bind_table = {
+            mod: tuple((event, getattr(self, handler)) for events, handler in parts for event in getattr(self, events))
+            for mod, parts in self._BIND_MODS.items()
+        }
+
     def _update_scroll(self, *_):
-        self.cell.update_idletasks()
+        # a burst of <Configure> events is collapsed into a single recompute
+        if self._pending_update is None:
+            self._pending_update = self.after_idle(self._do_update_scroll)
+
+    def _do_update_scroll(self):
+        self._pending_update = None
         self.cell.config(scrollregion=self.cell.bbox("all"))
 
     def config_container(self, **kwargs) -> None:
@@ -24,14 +24,147 @@
 
 from tkinter import Text
 from tkinter import END
-from re import Pattern, search, finditer
+from collections import defaultdict
+from threading import Thread
+from typing import Callable
+from functools import lru_cache
+from importlib.util import find_spec
+from re import Pattern, compile, error, IGNORECASE, MULTILINE, DOTALL, ASCII, VERBOSE
+try:
+    from re import _parser as sre_parse
+except ImportError:  # python < 3.11
+    import sre_parse
 
 
 __all__ = ["TextHighlighter"]
 
 
+def _compiled(patterns):
+    if isinstance(patterns, dict):
+        return {(p if isinstance(p, Pattern) else compile(p)): v for p, v in patterns.items()}
+    return {(p if isinstance(p, Pattern) else compile(p)) for p in patterns}
+
+
+def _compile_in_place(patterns):
+    # str patterns that were put into a configuration after the initialization
+    if patterns and not all(isinstance(p, Pattern) for p in patterns):
+        compiled = _compiled(patterns)
+        patterns.clear()
+        patterns.update(compiled)
+
+
+_SCOPED_FLAGS = ((IGNORECASE, "i"), (MULTILINE, "m"), (DOTALL, "s"), (ASCII, "a"))
+_GLOBAL_FLAGS = compile(r"^\(\?[aiLmsux]+\)")
+
+
+class _AnyOf(tuple):
+
+    def search(self, string):
+        for p in self:
+            if m := p.search(string):
+                return m
+
+
+@lru_cache(maxsize=64)
+def _fuse(patterns):
+    # one alternation for phases where only "does any pattern match" is of interest
+    if not patterns:
+        return None
+    if len(patterns) == 1:
+        return patterns[0]
+    if sum(1 for p in patterns if p.groups) > 1 or any(p.flags & VERBOSE for p in patterns):
+        # group references would shift / comments would swallow the closing parenthesis
+        return _AnyOf(patterns)
+    alternatives = list()
+    for p in sorted(patterns, key=lambda p: not p.groups):
+        flags = "".join(c for f, c in _SCOPED_FLAGS if p.flags & f)
+        alternatives.append("(?%s:%s)" % (flags, _GLOBAL_FLAGS.sub("", p.pattern)))
+    try:
+        return compile("|".join(alternatives))
+    except error:
+        return _AnyOf(patterns)
+
+
+_RE2_FLAGS = ((IGNORECASE, "i"), (MULTILINE, "m"), (DOTALL, "s"))
+
+
+@lru_cache(maxsize=256)
+def _re2(pattern):
+    # the re2 equivalent of a compiled pattern, or the pattern itself if re2 does not support it
+    import re2
+    if pattern is None:
+        return None
+    if isinstance(pattern, _AnyOf):
+        return _AnyOf(_re2(p) for p in pattern)
+    if pattern.flags & (ASCII | VERBOSE):
+        return pattern
+    flags = "".join(c for f, c in _RE2_FLAGS if pattern.flags & f)
+    try:
+        return re2.compile(("(?%s)" % flags if flags else "") + pattern.pattern)
+    except Exception:
+        return pattern
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return value
+    except TypeError:  # e.g. tkinter.font.Font, identified by its name
+        return str(value)
+
+
+@lru_cache(maxsize=256)
+def _literal(pattern):
+    # longest run of characters that is part of every match of the pattern; lines without it can be skipped
+    # ("" if there is none, which is contained in every line)
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return ""
+    if parsed.state.flags & IGNORECASE:
+        return ""
+    literal, run = "", ""
+    for op, av in parsed:
+        if op == sre_parse.LITERAL:
+            run += chr(av)
+        else:
+            run = ""
+        if len(run) > len(literal):
+            literal = run
+    return literal
+
+
+def _iter_lines(text):
+    # the lines of a text from tk, which ends with "\n" and separates lines by "\n" only
+    # (unlike str.splitlines), without building a list of them
+    pos = 0
+    while (nl := text.find("\n", pos)) != -1:
+        yield text[pos:nl]
+        pos = nl + 1
+
+
+def _tag_line(ln: str, n: int, items: tuple, pending: dict, ids: list = None) -> bool:
+    # the per line kernel: collect the ranges of the matches of `items' (pattern, tag, literal) in line `n' in `pending'
+    # and their ids in `ids'; free of instance state, so it can be compiled as it is (e.g. by cython)
+    matched = False
+    for p, tag, lit in items:
+        if lit not in ln:
+            continue
+        for m in p.finditer(ln):
+            matched = True
+            s, e = m.span()
+            start = f"{n}.{s}"
+            end = f"{n}.{e}"
+            pending[tag] += start, end
+            if ids is not None:
+                ids.append(f"{start}:{end}::{m.group()}")
+    return matched
+
+
 class TextHighlighter:
 
+    READ_CHUNK: int = 1000
+
     def __init__(self,
                  text: Text,
                  main_config: dict[Pattern]=False,
@@ -40,6 +173,8 @@ class TextHighlighter:
                  sub_loop: list[dict[Pattern], set[Pattern], dict[Pattern]]=False,
                  strict_sub_loop: list[dict[Pattern], set[Pattern], dict[Pattern]]=False,
                  at_call: dict[Pattern]=None,
+                 engine: str = "re",
+                 incremental: bool = False,
                  ):
 
         """
@@ -60,15 +195,25 @@ class TextHighlighter:
         :param sub_loop: Configurations for a special loop, the main configurations are still respected.
         :param strict_sub_loop: Strict loop, do not pay attention to the main configurations. But those of the parent loop when nested.
         :param at_call: (Global) Execute a function if the pattern matches. The function gets the line, the line number and the re.match.  If by this TextHighlighting itself is changed, the RuntimeError is caught and executed again.
+        :param engine: "re" or "re2": run the patterns with google-re2 (linear time, no catastrophic backtracking) where re2 supports them, the others (lookarounds, backreferences, ...) remain with re. Note that \\d, \\w and \\s only match ASCII characters in re2.
+        :param incremental: For a highlighter that processes the same text again after changes: remember the content and the loop state of each line and skip the tagging of lines that are unchanged since the last `self.highlight', the tags of changed lines are replaced. (Not used by `self.highlight_async')
         """
 
+        if engine == "re2":
+            if find_spec("re2") is None:
+                raise ImportError('engine="re2" requires the google-re2 package')
+        elif engine != "re":
+            raise ValueError(engine)
+
         self.text: Text = text
-        self.config: dict[Pattern] = (main_config if main_config else {})
-        self.first_clause: dict[Pattern] = first_clause
-        self.return_clause: set[Pattern] = (return_clause if return_clause else set())
-        self.sub_loop: list[dict[Pattern], set[Pattern], dict[Pattern]] = (sub_loop if sub_loop else [{}, set(), {}])
-        self.strict_sub_loop: list[dict[Pattern], set[Pattern], dict[Pattern]] = (strict_sub_loop if strict_sub_loop else [{}, set(), {}])
-        self.at_call = (at_call if at_call else {})
+        self.config: dict[Pattern] = (_compiled(main_config) if main_config else {})
+        self.first_clause: dict[Pattern] = (_compiled(first_clause) if first_clause else first_clause)
+        self.return_clause: set[Pattern] = (_compiled(return_clause) if return_clause else set())
+        self.sub_loop: list[dict[Pattern], set[Pattern], dict[Pattern]] = ([_compiled(c) for c in sub_loop] if sub_loop else [{}, set(), {}])
+        self.strict_sub_loop: list[dict[Pattern], set[Pattern], dict[Pattern]] = ([_compiled(c) for c in strict_sub_loop] if strict_sub_loop else [{}, set(), {}])
+        self.at_call = (_compiled(at_call) if at_call else {})
+        self.engine: str = engine
+        self.incremental: bool = incremental
 
         self.alltags: set = set()
         self.sub_tags: dict[str, set] = dict()
@@ -76,13 +221,225 @@ class TextHighlighter:
 
         self._read_start = "1.0"
 
-    def _add_tag(self, _lineno, _match, _kwarg):
-        start = "%d.%d" % (_lineno, _match.start())
-        end = "%d.%d" % (_lineno, _match.end())
-        _id = "%s:%s::%s" % (start, end, _match.group())
-        self.text.tag_add(_id, start, end)
-        self.text.tag_config(_id, **_kwarg)
-        return _id
+        self._tagpool: dict[tuple, tuple[str, frozenset]] = dict()
+        self._last_tag: tuple[str, frozenset] = (None, None)
+        self._ntags: int = 0
+        self._pending: defaultdict[str, list] = defaultdict(list)
+        self._async_id: int = 0
+        self._snapshot: tuple = None
+        self._line_cache: dict[int, tuple] = dict()
+        self._line_count: int = 0
+        self._stale: list[int] = list()
+
+        self._prepare()
+
+    def _tag(self, _phase, _pattern, _kwarg):
+        # one tk tag per configuration entry, created in the order in which the tags of a line are added;
+        # consecutive entries with the same style share a tag, a changed style gets a new one
+        key = frozenset((k, _hashable(v)) for k, v in _kwarg.items())
+        entry = self._tagpool.get((_phase, _pattern))
+        if entry is None or entry[1] != key:
+            if self._last_tag[1] == key:
+                entry = self._last_tag
+            else:
+                entry = self._last_tag = ("hl%x.%d" % (id(self), self._ntags), key)
+                self._ntags += 1
+                self.text.tag_config(entry[0], **_kwarg)
+            self._tagpool[(_phase, _pattern)] = entry
+        return entry[0]
+
+    def _prepare(self):
+        # iteration snapshots (pattern, tag, literal) of the configurations, refreshed per highlight and after at_call callbacks
+        sub, ssub = self.sub_loop, self.strict_sub_loop
+        for patterns in (self.config, self.first_clause, self.return_clause, self.at_call, *sub, *ssub):
+            _compile_in_place(patterns)
+        e = (_re2 if self.engine == "re2" else (lambda p: p))
+        self._sub_items = (tuple((e(p), self._tag(0, p, kw), _literal(p)) for p, kw in sub[0].items()),
+                           e(_fuse(tuple(sub[1]))),
+                           tuple((e(p), self._tag(1, p, kw), _literal(p)) for p, kw in sub[2].items()))
+        self._ssub_items = (tuple((e(p), self._tag(2, p, kw), _literal(p)) for p, kw in ssub[0].items()),
+                            e(_fuse(tuple(ssub[1]))),
+                            tuple((e(p), self._tag(3, p, kw), _literal(p)) for p, kw in ssub[2].items()))
+        self._fc_items = (tuple((e(p), self._tag(4, p, kw), _literal(p)) for p, kw in self.first_clause.items()) if self.first_clause else ())
+        self._cfg_items = tuple((e(p), self._tag(5, p, kw), _literal(p)) for p, kw in self.config.items())
+        self._rc_search = e(_fuse(tuple(self.return_clause)))
+        self._ac_items = tuple((e(p), f, _literal(p)) for p, f in self.at_call.items())
+        # a single search that tells whether any of the return, at_call and break clauses can apply to a line
+        clauses = (tuple(self.return_clause), tuple(self.at_call), tuple(sub[1]), tuple(ssub[1]))
+        gate = (_fuse(sum(clauses, ())) if sum(1 for c in clauses if c) > 1 else None)
+        self._gate = (e(gate) if isinstance(gate, Pattern) else None)
+        snapshot = (self._sub_items, self._ssub_items, self._fc_items, self._cfg_items, self._rc_search, self._ac_items)
+        if snapshot != self._snapshot:
+            self._snapshot = snapshot
+            self._line_cache.clear()
+
+    def _flush_tags(self):
+        # one `tag add' call with all ranges per tag, after the tags of changed lines (incremental) have been removed
+        call, w = self.text.tk.call, self.text._w
+        if self._stale:
+            ranges = list()
+            a = b = self._stale[0]
+            for n in self._stale[1:]:
+                if n != b + 1:
+                    ranges += f"{a}.0", f"{b + 1}.0"
+                    a = n
+                b = n
+            ranges += f"{a}.0", f"{b + 1}.0"
+            for tag in self.alltags:
+                call(w, "tag", "remove", tag, *ranges)
+            self._stale.clear()
+        for tag, ranges in self._pending.items():
+            call(w, "tag", "add", tag, *ranges)
+        self.alltags.update(self._pending)
+        self._pending.clear()
+
+    def _flush(self):
+        for tag in self.alltags:
+            self.text.tag_remove(tag, "1.0", END)
+        self.alltags: set = set()
+        self.sub_tags: dict[str, set] = dict()
+        self.ssub_tags: dict[str, set] = dict()
+
+    def _read_lines(self, read_start):
+        # the lines from `read_start' on, fetched in chunks of READ_CHUNK lines instead of copying the whole rest of the text
+        last = int(self.text.index("end-1c").partition('.')[0])
+        line = int(read_start.partition('.')[0])
+        start = read_start
+        while line <= last:
+            yield from _iter_lines(self.text.get(start, f"{line + self.READ_CHUNK}.0"))
+            line += self.READ_CHUNK
+            start = f"{line}.0"
+
+    def _scan(self, lines, read_start, note_first_clause, pending, sub_tags, ssub_tags, calls=None, cache=None):
+        # the highlighting pass over `lines' (read from `read_start'), without tk calls except for the at_call
+        # callbacks when they are executed directly (`calls' is None), otherwise they are collected in `calls'.
+        # with a `cache', the tagging of lines whose content and incoming state are unchanged is skipped,
+        # the other lines are noted in self._stale.
+        # returns the read start of the last match.
+
+        sub_items, ssub_items, fc_items, cfg_items = self._sub_items, self._ssub_items, self._fc_items, self._cfg_items
+        rc_search, ac_items, gate = self._rc_search, self._ac_items, self._gate
+
+        first = bool(fc_items and note_first_clause)
+        _config = (fc_items if first else cfg_items)
+        sub_parent: str | None = None
+        ssub_parent: str | None = None
+        _read_start = read_start
+
+        lines = iter(lines)
+        n = int(read_start.partition('.')[0]) - 1
+        again = False
+        record = None
+
+        while True:
+            if again:
+                again = False
+            else:
+                if record is not None:
+                    # line content, incoming state -> outgoing state, read start moved to this line
+                    cache[n] = (*record, (first, sub_parent, ssub_parent), _read_start != record[2])
+                    record = None
+                if (ln := next(lines, None)) is None:
+                    break
+                n += 1
+
+            clause = (gate is None or gate.search(ln) is not None)
+
+            if clause and rc_search and rc_search.search(ln):
+                return _read_start
+
+            if clause and ac_items:
+                if calls is not None:
+                    for p, f, lit in ac_items:
+                        if lit in ln and (m := p.search(ln)):
+                            calls.append((f, ln, n, m))
+                else:
+                    # each function is called at most once per line; after a RuntimeError or if the
+                    # configuration was changed by them, only those that have not yet been called are run again
+                    fired = set()
+                    retry = True
+                    while retry:
+                        retry = False
+                        try:
+                            for p, f, lit in ac_items:
+                                if p not in fired and lit in ln and (m := p.search(ln)):
+                                    if not fired:
+                                        self._flush_tags()
+                                    fired.add(p)
+                                    f.__call__(ln, n, m)
+                        except RuntimeError:
+                            retry = True
+                        if fired:
+                            _ac_items = ac_items
+                            self._prepare()
+                            sub_items, ssub_items, fc_items, cfg_items = self._sub_items, self._ssub_items, self._fc_items, self._cfg_items
+                            rc_search, ac_items, gate = self._rc_search, self._ac_items, self._gate
+                            _config = (fc_items if first else cfg_items)
+                            retry = retry or ac_items != _ac_items
+
+            if cache is not None and record is None:
+                state = (first, sub_parent, ssub_parent)
+                if (c := cache.get(n)) is not None and c[0] == ln and c[1] == state:
+                    first, sub_parent, ssub_parent = c[3]
+                    _config = (fc_items if first else cfg_items)
+                    if c[4]:
+                        _read_start = f"{n}.0"
+                    continue
+                record = (ln, state, _read_start)
+                self._stale.append(n)
+
+            if sub_parent is None:
+                ids = list()
+                if _tag_line(ln, n, sub_items[0], pending, ids):
+                    for _id in ids:
+                        sub_tags[_id] = set()
+                    sub_parent = ids[-1]
+
+            else:
+                if clause and sub_items[1] and sub_items[1].search(ln):
+                    # break clause: re-read this line from the top level
+                    _read_start = f"{n}.0"
+                    _config = cfg_items
+                    first = False
+                    sub_parent = None
+                    ssub_parent = None
+                    again = True
+                    continue
+
+                ids = list()
+                if _tag_line(ln, n, sub_items[2], pending, ids):
+                    sub_tags[sub_parent].update(ids)
+
+            if ssub_parent is None:
+                ids = list()
+                if _tag_line(ln, n, ssub_items[0], pending, ids):
+                    for _id in ids:
+                        ssub_tags[_id] = set()
+                    ssub_parent = ids[-1]
+                    continue
+
+            else:
+                if clause and ssub_items[1] and ssub_items[1].search(ln):
+                    # break clause: re-read this line from the top level
+                    _read_start = f"{n}.0"
+                    _config = cfg_items
+                    first = False
+                    sub_parent = None
+                    ssub_parent = None
+                    again = True
+                    continue
+
+                ids = list()
+                if _tag_line(ln, n, ssub_items[2], pending, ids):
+                    ssub_tags[ssub_parent].update(ids)
+                continue
+
+            if _tag_line(ln, n, _config, pending):
+                _config = cfg_items
+                first = False
+                _read_start = f"{n}.0"
+
+        return _read_start
 
     def highlight(self, flush: bool = False, read_start: str = "1.0", note_first_clause: bool = True) -> int:
 
@@ -94,89 +451,76 @@ class TextHighlighter:
         """
 
         if flush and self.alltags:
-            self.text.tag_delete(*self.alltags)
-            self.alltags: set = set()
-            self.sub_tags: dict[str, set] = dict()
-            self.ssub_tags: dict[str, set] = dict()
-
-        _config = (self.first_clause if self.first_clause and note_first_clause else self.config)
-        inside_sub_loop = False
-        inside_ssub_loop = False
-
-        self._read_start = read_start
-
-        for n, ln in enumerate(self.text.get(read_start, END).splitlines(), int(search("\d+", read_start).group())):
-
-            for p in self.return_clause:
-                if search(p, ln):
-                    return int(self._read_start.split('.')[0])
-
-            try:
-                for p in self.at_call:
-                    if m := search(p, ln):
-                        self.at_call[p].__call__(ln, n, m)
-            except RuntimeError:
-                for p in self.at_call:
-                    if m := search(p, ln):
-                        self.at_call[p].__call__(ln, n, m)
-
-            if not inside_sub_loop:
-                for p in self.sub_loop[0]:
-                    for m in finditer(p, ln):
-                        _id = self._add_tag(n, m, self.sub_loop[0][p])
-                        self.alltags.add(_id)
-                        self.sub_tags[_id] = set()
-                        inside_sub_loop = _id
+            self._flush()
 
-            else:
-                for p in self.sub_loop[1]:
-                    if search(p, ln):
-                        self._read_start = "%d.0" % n
-                        return self.highlight(False, "%d.0" % n, False)
-
-                if inside_sub_loop:
-                    for p in self.sub_loop[2]:
-                        for m in finditer(p, ln):
-                            _id = self._add_tag(n, m, self.sub_loop[2][p])
-                            self.alltags.add(_id)
-                            self.sub_tags[inside_sub_loop].add(_id)
-
-            if not inside_ssub_loop:
-                for p in self.strict_sub_loop[0]:
-                    for m in finditer(p, ln):
-                        _id = self._add_tag(n, m, self.strict_sub_loop[0][p])
-                        self.alltags.add(_id)
-                        self.ssub_tags[_id] = set()
-                        inside_ssub_loop = _id
-
-                if inside_ssub_loop:
-                    continue
+        self._prepare()
 
-            else:
-                for p in self.strict_sub_loop[1]:
-                    if search(p, ln):
-                        self._read_start = "%d.0" % n
-                        return self.highlight(False, "%d.0" % n, False)
-
-                if inside_ssub_loop:
-                    for p in self.strict_sub_loop[2]:
-                        for m in finditer(p, ln):
-                            _id = self._add_tag(n, m, self.strict_sub_loop[2][p])
-                            self.alltags.add(_id)
-                            self.ssub_tags[inside_ssub_loop].add(_id)
-                    continue
+        cache = None
+        if self.incremental:
+            cache = self._line_cache
+            line_count = int(self.text.index("end-1c").partition('.')[0])
+            if flush or line_count != self._line_count:
+                # line numbers shifted, the tags may have moved with their text
+                cache.clear()
+                self._line_count = line_count
+
+        self._read_start = self._scan(self._read_lines(read_start), read_start, note_first_clause,
+                                      self._pending, self.sub_tags, self.ssub_tags, cache=cache)
+        self._flush_tags()
+        return int(self._read_start.partition('.')[0])
+
+    def highlight_async(self, callback: Callable[[int], ...] | None = None, flush: bool = False, read_start: str = "1.0",
+                        note_first_clause: bool = True, poll_ms: int = 20) -> None:
 
-            for p in _config:
-                matched = False
-                for m in finditer(p, ln):
-                    matched = True
-                    _id = self._add_tag(n, m, _config[p])
-                    self.alltags.add(_id)
-                if matched:
-                    _config = self.config
-                    self._read_start = "%d.0" % n
-
-        return int(self._read_start.split('.')[0])
+        """
+        Like `self.highlight', but the patterns are matched in a thread and the tags are added in one go afterwards,
+        so that the ui stays responsive while a large text is processed.
+        A running process is discarded when the method is called again.
+
+        The at_call functions are executed in the main thread after the tags have been added;
+        changes they make to the configurations do not affect the current process.
+
+        :param callback: gets the line number of the last match
+        :param flush: delete all tags
+        :param read_start: from there shall be read (line.column)
+        :param note_first_clause: note first_clause
+        :param poll_ms: interval in which the main thread checks whether the thread is done
+        """
+
+        if flush and self.alltags:
+            self._flush()
+
+        self._prepare()
+
+        self._async_id += 1
+        async_id = self._async_id
+        pending, sub_tags, ssub_tags, calls, result = defaultdict(list), dict(), dict(), list(), list()
+
+        def scan(text):
+            result.append(self._scan(_iter_lines(text), read_start, note_first_clause, pending, sub_tags, ssub_tags, calls))
+
+        def apply():
+            if async_id != self._async_id:
+                return
+            if thread.is_alive():
+                self.text.after(poll_ms, apply)
+                return
+            if not result:  # the thread failed
+                return
+            for tag, ranges in pending.items():
+                self._pending[tag] += ranges
+            self._flush_tags()
+            self.sub_tags.update(sub_tags)
+            self.ssub_tags.update(ssub_tags)
+            self._read_start = result[0]
+            for f, ln, n, m in calls:
+                f.__call__(ln, n, m)
+            if callback:
+                callback(int(self._read_start.partition('.')[0]))
+
+        thread = Thread(target=scan, args=(self.text.get(read_start, END),), daemon=True)
+        thread.start()
+        self.text.after(poll_ms, apply)
 
 if __name__ == "__main__":
     from tkinter import Tk
@@ -47,15 +47,17 @@ class ManWidget(ttk.Notebook):
             text_label.pack(expand=True, fill=tk.BOTH)
 
             def page_sizing(e, canvas=canvas, page=page):
-                canvas.config(scrollregion="0 0 {0} {1}".format(page.winfo_reqwidth(), page.winfo_reqheight()))
-                if page.winfo_reqwidth() is not canvas.winfo_width():
-                    canvas.config(width=page.winfo_reqwidth())
+                width = page.winfo_reqwidth()
+                canvas.config(scrollregion="0 0 {0} {1}".format(width, page.winfo_reqheight()))
+                if width != canvas.winfo_width():
+                    canvas.config(width=width)
 
             page.bind("<Configure>", page_sizing)
 
             def canvas_sizing(e, canvas=canvas, page=page):
-                if page.winfo_reqwidth() is not canvas.winfo_width():
-                    canvas.configure(width=page.winfo_reqwidth())
+                width = page.winfo_reqwidth()
+                if width != e.width:
+                    canvas.configure(width=width)
 
             canvas.bind("<Configure>", canvas_sizing)
 
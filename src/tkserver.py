@@ -1,11 +1,75 @@
 from __future__ import annotations
 
-from multiprocessing import Process
+from gc import disable as _gc_disable, enable as _gc_enable, isenabled as _gc_isenabled
 from os import kill as _kill, getpid
-from pickle import dumps, loads
-from socket import socket, AF_INET, SOCK_STREAM, SOL_SOCKET, SO_REUSEADDR, SHUT_RDWR
-from tkinter import Tk
-from typing import Callable, ParamSpec, Iterable, Generic, TypeVar, ContextManager
+from selectors import DefaultSelector, EVENT_READ
+from socket import socket, socketpair, AF_INET, SOCK_STREAM, SOL_SOCKET, SO_REUSEADDR, SO_KEEPALIVE, SHUT_RDWR, IPPROTO_TCP, TCP_NODELAY
+from struct import Struct
+from typing import Callable, ParamSpec, Iterable, Generic, TypeVar, ContextManager, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from multiprocessing import Process
+    from tkinter import Tk
+
+try:
+    from msgspec.msgpack import Encoder as _Encoder, Decoder as _Decoder
+    _ENCODER = _Encoder()
+    _DECODER = _Decoder()
+except ImportError:
+    _Encoder = _Decoder = _ENCODER = _DECODER = None
+
+try:
+    from socket import MSG_WAITALL as _WAITALL
+except ImportError:
+    _WAITALL = 0
+
+# message length prefix
+_HEADER = Struct(">I")
+_RECV_CHUNK = 65536
+# scatter-gather sends (POSIX), limited by the common IOV_MAX
+_SENDMSG = hasattr(socket, "sendmsg")
+_IOV_MAX = 1024
+# complete frames of small scalar values are cached per server
+_CACHEABLE = frozenset((type(None), bool, int, str, bytes))
+_CACHE_SIZE = 256
+_CACHE_ITEM = 128
+
+
+def _encode(obj: object, pickle: bool) -> tuple[bytes, bytes]:
+    # bytes, str and small int are sent natively behind a one-byte type tag
+    cls = type(obj)
+    if cls is bytes:
+        return b'B', obj
+    if cls is str:
+        return b'S', obj.encode()
+    if cls is int and -0x8000000000000000 <= obj <= 0x7fffffffffffffff:
+        return b'I', obj.to_bytes(8, "big", signed=True)
+    if pickle or _ENCODER is None:
+        from pickle import dumps
+        return b'P', dumps(obj)
+    return b'M', _ENCODER.encode(obj)
+
+
+def _decode(data: memoryview, decoder: _Decoder | None) -> object:
+    tag = data[0]
+    body = data[1:]
+    if tag == 0x53:  # S
+        return str(body, "utf-8")
+    if tag == 0x49:  # I
+        return int.from_bytes(body, "big", signed=True)
+    if tag == 0x42:  # B
+        return bytes(body)
+    # no cyclic gc runs while the containers are built
+    gc = _gc_isenabled()
+    _gc_disable()
+    try:
+        if tag == 0x4d:  # M
+            return decoder.decode(body)
+        from pickle import loads
+        return loads(body)
+    finally:
+        if gc:
+            _gc_enable()
 
 try:
     # UNIX
@@ -36,53 +100,90 @@ class TkBgReceiver(ContextManager, Generic[_R]):
 
     server: TkBgServer
     sock: socket
+    _sel: DefaultSelector
+    _buf: bytearray
 
     def __init__(
             self,
             server: TkBgServer,
+            sock: socket | None = None,
     ):
         self.server = server
-        self.sock = socket(AF_INET, SOCK_STREAM)
-        self.sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
-        self.sock.connect(server.server_address)
+        if sock is None:
+            self.sock = socket(AF_INET, SOCK_STREAM)
+            self.sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+            self.sock.connect(server.server_address)
+        else:
+            self.sock = sock
+        self._sel = DefaultSelector()
+        self._sel.register(self.sock, EVENT_READ)
+        self._buf = bytearray()
 
     def close_connection(self):
         """Send the shutdown signal and close the socket."""
+        if getattr(self, "sock", None) is None:
+            return
         try:
             self.sock.shutdown(SHUT_RDWR)
         except OSError as e:
             if e.errno != 107:  # Transport endpoint is not connected
                 raise
+        self._sel.close()
         self.sock.close()
+        self.sock = None
 
-    def kill_server(self):
+    def kill_server(self, timeout: float = 1.0):
         """
         Kill the server process by the sequence
             - SIGKILL (UNIX) / SIGABRT (WINDOWS)
             - SIGTERM
             - SIGBREAK
+
+        The next signal is only sent if the process is still alive `timeout` seconds after the previous one.
         """
-        pid = self.server.process.pid
+        process = self.server.process
         for sig in _killsigs:
-            _kill(pid, sig)
+            if process.exitcode is not None:
+                return
+            try:
+                _kill(process.pid, sig)
+            except ProcessLookupError:
+                return
+            process.join(timeout)
 
     def terminate_server(self):
         """Terminate the server process by SIGTERM, send the shutdown signal and close the socket."""
         self.server.process.terminate()
         self.close_connection()
 
+    def _recv_exact(self, n: int) -> memoryview:
+        # The buffer is reused across the calls and only reallocated if it is
+        # too small or more than four times larger than the message.
+        size = len(self._buf)
+        if size < n or (size > 4 * n and size > _RECV_CHUNK):
+            self._buf = bytearray(max(n, _RECV_CHUNK))
+        view = memoryview(self._buf)
+        off = 0
+        while off < n:
+            if not (r := self.sock.recv_into(view[off:], min(_RECV_CHUNK, n - off), _WAITALL)):
+                view.release()
+                raise EOFError("Connection closed by the server")
+            off += r
+        return view[:n]
+
     def receive(self, block: bool = False, block_value: object = None) -> _R:
         """Receive a value from the socket."""
-        self.sock.setblocking(block)
-        try:
-            data = b''
-            while _data := self.sock.recv(1024):
-                data += _data
-            return loads(data)
-        except BlockingIOError:
+        if not self._sel.select(None if block else 0):
             return block_value
-
-    def __delete__(self):
+        head = b''
+        while len(head) < _HEADER.size:
+            if not (rest := self.sock.recv(_HEADER.size - len(head), _WAITALL)):
+                raise EOFError("Connection closed by the server")
+            head += rest
+        with self._recv_exact(_HEADER.unpack(head)[0]) as data:
+            return _decode(data, self.server.decoder)
+
+    def __del__(self):
         self.close_connection()
 
     def __enter__(self) -> TkBgReceiver:
@@ -95,21 +196,86 @@ class TkBgReceiver(ContextManager, Generic[_R]):
 class TkBgServer(Generic[_P, _R]):
     """This **wrap** is created by ``TkBgWrapper``."""
 
+    COALESCE_MS: int = 10
+    COALESCE_SIZE: int = 16384
+
     make: Callable[[TkBgServer, _P], Tk]
     tk: Tk
     sock: socket | None
+    conn: socket | None
+    peer: socket | None
     instand_return: bool
     instand_block: bool
     process_daemon: bool
     process: Process
-    address_pool: tuple[tuple[str, int]] | None
+    address_pool: tuple[tuple[str, int]] | str | None
     server_address: tuple[str, int] | None
+    pickle: bool
+    decoder: _Decoder | None
+    _outq: list[bytes]
+    _outq_size: int
+    _flush_id: str | None
+    _encode_cache: dict[tuple[type, object], bytes]
+
+    def _frame(self, obj: _R) -> bytes:
+        tag, buf = _encode(obj, self.pickle)
+        return _HEADER.pack(len(buf) + 1) + tag + buf
+
+    def _queue(self, obj: _R):
+        cls = type(obj)
+        if cls in _CACHEABLE:
+            key = (cls, obj)
+            if (frame := self._encode_cache.get(key)) is None:
+                frame = self._frame(obj)
+                if len(frame) <= _CACHE_ITEM and len(self._encode_cache) < _CACHE_SIZE:
+                    self._encode_cache[key] = frame
+            self._outq.append(frame)
+            self._outq_size += len(frame)
+        else:
+            tag, buf = _encode(obj, self.pickle)
+            self._outq.append(_HEADER.pack(len(buf) + 1))
+            self._outq.append(tag)
+            self._outq.append(buf)
+            self._outq_size += _HEADER.size + 1 + len(buf)
+
+    def _flush(self):
+        self._flush_id = None
+        if self._outq and self.sock:
+            self._ensure_conn()
+            if _SENDMSG and len(self._outq) <= _IOV_MAX:
+                sent = self.conn.sendmsg(self._outq)
+                if sent < self._outq_size:
+                    self.conn.sendall(b"".join(self._outq)[sent:])
+            else:
+                self.conn.sendall(b"".join(self._outq))
+        self._outq.clear()
+        self._outq_size = 0
 
     def send(self, obj: _R):
-        """Send a pickable object via the socket."""
+        """
+        Send a msgpack-serializable (or pickable if `pickle` is set) object via the socket.
+
+        While the Tk mainloop is running, the objects are collected and sent together
+        after `COALESCE_MS` milliseconds or as soon as `COALESCE_SIZE` bytes are reached.
+        """
+        if self.sock:
+            self._queue(obj)
+            if self.tk is None or self._outq_size >= self.COALESCE_SIZE:
+                self._flush()
+            elif self._flush_id is None:
+                self._flush_id = self.tk.after(self.COALESCE_MS, self._flush)
+
+    def send_now(self, obj: _R):
+        """Send an object via the socket immediately, together with all pending objects."""
         if self.sock:
-            conn, addr = self.sock.accept()
-            return conn.send(dumps(obj))
+            self._queue(obj)
+            self._flush()
+
+    def _ensure_conn(self):
+        if self.conn is None:
+            self.conn, addr = self.sock.accept()
+            self.conn.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+            self.conn.setsockopt(SOL_SOCKET, SO_KEEPALIVE, 1)
 
     @staticmethod
     def kill_process():
@@ -125,26 +291,45 @@ class TkBgServer(Generic[_P, _R]):
 
     def open_socket(self):
         """Open a new socket."""
-        if self.address_pool:
+        if self.address_pool == "socketpair":
+            # AF_UNIX on POSIX; the receiver end is stored in `peer`
+            self.sock, self.peer = socketpair()
+            self.conn = self.sock
+        elif self.address_pool:
+            self.sock = socket(AF_INET, SOCK_STREAM)
+            self.sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
             for addr in self.address_pool:
                 try:
-                    self.sock = socket(AF_INET, SOCK_STREAM)
-                    self.sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
                     self.sock.bind(addr)
-                    self.sock.listen(1)
-                    self.server_address = addr
-                    return
+                    break
                 except OSError as e:
                     if e.errno != 98:  # Address already in use
+                        self.sock.close()
+                        self.sock = None
                         raise
             else:
-                self.close_socket()
-                err = OSError(f"All address already in use: {self.address_pool}")
-                err.errno = 98
-                raise err
+                # all addresses in use, let the system choose a free port
+                self.sock.bind((self.address_pool[0][0], 0))
+            self.sock.listen(1)
+            self.server_address = self.sock.getsockname()
 
     def close_socket(self):
         """Close the socket."""
+        try:
+            self._flush()
+        except OSError as e:
+            if e.errno not in (9, 32):  # Receiver closed
+                raise
+        if self.conn:
+            try:
+                self.conn.shutdown(SHUT_RDWR)
+            except OSError as e:
+                if e.errno != 107:  # Transport endpoint is not connected
+                    raise
+            self.conn.close()
+            if self.conn is self.sock:
+                self.sock = None
+            self.conn = None
         if self.sock:
             try:
                 self.sock.shutdown(SHUT_RDWR)
@@ -163,44 +348,76 @@ class TkBgServer(Generic[_P, _R]):
         self.kill_tk()
         self.close_socket()
 
-    def __delete__(self):
-        self.close_socket()
+    def __del__(self):
+        if getattr(self, "_outq", None) is not None:
+            self.close_socket()
 
     def __init__(
             self,
             make: Callable[[TkBgServer, _P], Tk],
-            address_pool: tuple[tuple[str, int]] | tuple | None = ("127.0.0.11", 50_000),
+            address_pool: tuple[tuple[str, int]] | tuple | str | None = "socketpair",
             process_daemon: bool = True,
             instand_return: bool = False,
             instand_return_blocking: bool = True,
+            pickle: bool = False,
+            decode_type: type | None = None,
+            prepickle: Iterable[None | bool | int | str | bytes] = (),
     ):
         self.make = make
+        self.tk = None
+        self.pickle = pickle
+        if decode_type is None or _Decoder is None:
+            self.decoder = _DECODER
+        else:
+            # the terminal None of send_now(None) is also msgpack
+            self.decoder = _Decoder(Optional[decode_type])
         self.address_pool = address_pool
-        self.sock = self.server_address = None
+        self.sock = self.conn = self.peer = self.server_address = None
         self.instand_return = instand_return
         self.instand_block = instand_return_blocking
         self.process_daemon = process_daemon
+        self._outq = list()
+        self._outq_size = 0
+        self._flush_id = None
+        self._encode_cache = dict()
+        for obj in prepickle:
+            if type(obj) not in _CACHEABLE:
+                raise TypeError(f"prepickle: {type(obj).__name__} is not None, bool, int, str or bytes")
+            self._encode_cache[(type(obj), obj)] = self._frame(obj)
 
     def __call__(self, *args: _P.args, **kwargs: _P.kwargs) -> TkBgReceiver[_R] | object:
         if not self.sock:
             self.open_socket()
 
         def proc(*_args, **_kwargs):
+            if self.peer:
+                self.peer.close()
+                self.peer = None
             self.tk = self.make(*_args, **_kwargs | dict(server=self))
             self.tk.mainloop()
             try:
-                self.send(None)
+                self.send_now(None)
             except OSError as e:
-                if e.errno != 9:  # Receiver closed
+                if e.errno not in (9, 32):  # Receiver closed
                     raise
             return
 
-        self.process = Process(target=proc, args=args, kwargs=kwargs, daemon=self.process_daemon)
+        from multiprocessing import get_context
+        from sys import platform
+        # fork inherits the open socket and skips the re-import of the modules;
+        # only on Linux, forking after Tk/Cocoa was initialized crashes on macOS
+        ctx = get_context("fork" if platform.startswith("linux") else None)
+        self.process = ctx.Process(target=proc, args=args, kwargs=kwargs, daemon=self.process_daemon)
 
         if self.sock:
-            recv = TkBgReceiver(self)
+            recv = TkBgReceiver(self, self.peer)
             self.process.start()
 
+            if self.peer:
+                # the pair is used up by this process, close the copy of the server end
+                self.sock.close()
+                self.sock = self.conn = self.peer = None
+
             if self.instand_return:
                 return recv.receive(self.instand_block)
             else:
@@ -212,10 +429,13 @@ class TkBgServer(Generic[_P, _R]):
 
 
 def TkBgWrapper(
-        address: tuple[str, int] | Iterable[tuple[str, int]] | tuple | None = ("127.0.0.11", 50_000),
+        address: tuple[str, int] | Iterable[tuple[str, int]] | tuple | str | None = "socketpair",
         process_daemon: bool = True,
         instand_return: bool = False,
         instand_return_blocking: bool = True,
+        pickle: bool = False,
+        decode_type: type | None = None,
+        prepickle: Iterable[None | bool | int | str | bytes] = (),
 ):
     """
     This **decorator** is for executing the Tk mainloop in a separate
@@ -232,12 +452,27 @@ def TkBgWrapper(
     parameter named `server`. Here the :class:`TkBgServer` is passed.
 
     The transmission of values from the function is done via a socket
-    by ``server.send(<obj>)``, the object must be **pickable**.
-
-    By default, the socket is only created when the decorated function
-    is called, but can be created at any time by ``.open_socket()``.
+    by ``server.send(<obj>)``. If ``msgspec`` is installed, the objects
+    are serialized with msgpack and are restricted to the msgpack types
+    (None, bool, int, float, str, bytes, list, dict, ...; tuples are
+    received as lists). Set `pickle` to True to transfer other objects,
+    these must then be **pickable**. Without ``msgspec``, pickle is
+    always used.
+    Optionally, the expected type of the msgpack values can be passed
+    as `decode_type` (e.g. ``list[str]``) for a faster, typed decoding.
+    The encoded messages of small scalar values are cached by the server,
+    frequently sent constants (e.g. ``None``, ``"ok"``) can be
+    registered in advance via `prepickle`.
+
+    By default (`address` is ``"socketpair"``), a connected socket pair
+    (AF_UNIX on POSIX) is created for each call of the decorated
+    function and no address is occupied.
+    If one or more addresses are passed, an AF_INET socket is only
+    created when the decorated function is called, but can be created
+    at any time by ``.open_socket()``.
     For better compatibility, a pool of available addresses can be
-    defined.
+    defined; if all of them are in use (or the port is 0), a free port
+    chosen by the system is used on the host of the first address.
 
     By default, the :class:`TkBgReceiver` is returned when the decorated
     function is executed.
@@ -308,7 +543,9 @@ def TkBgWrapper(
             value = func()
             ...
     """
-    if address:
+    if address == "socketpair":
+        address_pool = address
+    elif address:
         if not isinstance(address[0], tuple):
             address_pool = (address,)
         else:
@@ -317,6 +554,6 @@ def TkBgWrapper(
         address_pool = None
 
     def wrap(make: Callable[[TkBgServer, _P], Tk]) -> TkBgServer[_P]:
-        return TkBgServer(make, address_pool, process_daemon, instand_return, instand_return_blocking)
+        return TkBgServer(make, address_pool, process_daemon, instand_return, instand_return_blocking, pickle, decode_type, prepickle)
 
     return wrap
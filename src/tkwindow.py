@@ -1,6 +1,35 @@
+from functools import cached_property
 from tkinter import Tk
 from typing import Literal
 
+# Drag handlers evaluated in the Tcl interpreter, the motion events are coalesced until idle.
+_DRAG_PROCS = """
+namespace eval ::tkwindow {
+    variable wx 0
+    variable wy 0
+    variable pos {}
+    proc drag {x y} {
+        variable wx $x
+        variable wy $y
+    }
+    proc move {w X Y} {
+        variable wx
+        variable wy
+        variable pos
+        if {$pos eq {}} {
+            after idle [list ::tkwindow::place $w]
+        }
+        set pos +[expr {$X - $wx}]+[expr {$Y - $wy}]
+    }
+    proc place {w} {
+        variable pos
+        if {[winfo exists $w]} {
+            wm geometry $w $pos
+        }
+        set pos {}
+    }
+}
+"""
 
 class TkWindow(Tk):
     """
@@ -18,9 +47,6 @@ class TkWindow(Tk):
         Create the functionality to be able to move the window by holding it at any position.
     """
 
-    fullscreen_height: int
-    fullscreen_width: int
-
     def __init__(
             self,
             window_mode: Literal["dead", "headless", "top"] = None,
@@ -32,9 +58,6 @@ class TkWindow(Tk):
 
         self.resizable(*resizable)
 
-        self.fullscreen_height = int(self.winfo_screenheight() * 0.0756)
-        self.fullscreen_width = int(self.winfo_screenwidth() * 0.062)
-
         if window_mode:
             if window_mode == "dead":
                 self.overrideredirect(True)
@@ -46,19 +69,24 @@ class TkWindow(Tk):
                 self.attributes('-topmost', True)
 
         if drag:
-            wx, wy = 0, 0
+            self.tk.eval(_DRAG_PROCS)
+            self.bind('<Button-1>', '::tkwindow::drag %x %y')
+            self.bind('<B1-Motion>', f'::tkwindow::move {self._w} %X %Y')
 
-            def _drag(event):
-                nonlocal wx, wy
-                wx, wy = event.x, event.y
+        self.title(title)
 
-            def _move(event):
-                self.geometry('+{0}+{1}'.format(event.x_root - wx, event.y_root - wy))
+    @cached_property
+    def _screensize(self) -> tuple[int, int]:
+        height, width = self.tk.splitlist(self.tk.eval(f"list [winfo screenheight {self._w}] [winfo screenwidth {self._w}]"))
+        return int(height), int(width)
 
-            self.bind('<Button-1>', _drag)
-            self.bind('<B1-Motion>', _move)
+    @cached_property
+    def fullscreen_height(self) -> int:
+        return int(self._screensize[0] * 0.0756)
 
-        self.title(title)
+    @cached_property
+    def fullscreen_width(self) -> int:
+        return int(self._screensize[1] * 0.062)
 
     def resize(self, height: int, width: int):
         self.configure(height=height, width=width)
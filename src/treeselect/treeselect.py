@@ -3,15 +3,132 @@ from __future__ import annotations
 import json
 import tkinter as tk
 import tkinter.ttk as ttk
+from bisect import bisect_left, bisect_right
+from functools import cached_property, lru_cache, partial
 from os import environ
 from pathlib import Path
-from re import Pattern, search, compile, IGNORECASE, error as ReError, escape
+from re import Pattern, compile, IGNORECASE, UNICODE, error as ReError, escape
+from sys import platform
 from tkinter.filedialog import askopenfile, asksaveasfile
 from typing import Generator, Callable
 from typing import Literal, Any, Iterable
 
 from ..manwidget import ManWidget
 
+# Shift, Control and Alt of the event state; Lock and NumLock are ignored.
+# Alt is Mod1 (0x8) on X11 and 0x20000 on Windows, where Mod1 is NumLock.
+_STATE_MODIFIERS = 0x1 | 0x4 | (0x20000 if platform == "win32" else 0x8)
+
+# runs a foreach in its own procedure frame, so its loop variables do not leak into the global namespace
+_FOREACH = "{names values script} {foreach $names $values $script}"
+
+# the check box images, read once
+_CHECKBOX_PNG = {
+    name: Path(__file__).parent.joinpath("dat", "checkbox_%s18.png" % name).read_bytes()
+    for name in ("checked", "unchecked", "hover")
+}
+
+try:
+    from orjson import dumps as _orjson_dumps, loads as _json_loads
+except ImportError:
+    _orjson_dumps = None
+    _json_loads = json.loads
+
+
+def _json_dumps(obj) -> bytes:
+    if _orjson_dumps is not None:
+        try:
+            return _orjson_dumps(obj)
+        except TypeError:
+            # e.g. integers beyond 64 bit
+            pass
+    return json.dumps(obj).encode()
+
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+# \d, \w, \s and \b (not preceded by an escaping backslash) only match ASCII in re2
+_RE2_ASCII_CLASSES = compile(r"(?<!\\)(?:\\\\)*\\[dDwWsSbB]")
+
+
+def _re2_compile(pattern: str):
+    # The case-insensitive re2 pattern for the search of the widget; None if re2 is not available
+    # (or hyperscan is preferred) or the pattern is not supported by re2 or would match differently there.
+    if re2 is None or hyperscan is not None or _RE2_ASCII_CLASSES.search(pattern):
+        return None
+    try:
+        return re2.compile("(?i)" + pattern)
+    except re2.error:
+        return None
+
+
+@lru_cache(maxsize=64)
+def _hs_database(pattern: str, flags: int):
+    # Compile the `re` pattern for hyperscan; None if the pattern or flags are not supported there.
+    if flags & ~(IGNORECASE | UNICODE) or any(a in pattern for a in ("\\A", "\\Z", "\\z", "\\G")):
+        return None
+    hs_flags = hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    if flags & IGNORECASE:
+        hs_flags |= hyperscan.HS_FLAG_CASELESS
+    db = hyperscan.Database()
+    try:
+        db.compile(expressions=[pattern.encode()], ids=[0], flags=[hs_flags])
+    except hyperscan.error:
+        return None
+    return db
+
+
+def _hs_buffer(texts: list[str]) -> tuple[bytes, list[int]] | None:
+    # The `texts` newline separated in one buffer and the end offset of each;
+    # None if a text contains a newline itself.
+    chunks = list()
+    ends = list()
+    pos = 0
+    for text in texts:
+        if "\n" in text:
+            return None
+        chunk = text.encode()
+        chunks.append(chunk)
+        pos += len(chunk)
+        ends.append(pos)
+        pos += 1
+    return b"\n".join(chunks), ends
+
+
+def _hs_search(db, data: bytes, ends: list[int], start: int, end: int, verify: Callable[[int], bool]) -> list[int]:
+    # Scan the texts `start`:`end` of a buffer from _hs_buffer and return the indexes of the matching ones.
+    # Each match end is reported once with the leftmost start, which can lie in a previous text if the
+    # pattern consumes the separator; such texts are checked with `verify(index)`.
+    if start >= end:
+        return []
+    base = ends[start - 1] + 1 if start else 0
+    found = set()
+    verified = set()
+
+    def on_match(_id, _from, to, _flags, _context):
+        i = bisect_left(ends, to + base, start, end)
+        if i in found:
+            return
+        if _from + base > (ends[i - 1] if i else -1):
+            found.add(i)
+        elif i not in verified:
+            verified.add(i)
+            if verify(i):
+                found.add(i)
+
+    db.scan(data[base:ends[end - 1]], match_event_handler=on_match)
+    return sorted(found)
+
 
 class TagsConfig:
     """
@@ -96,7 +213,7 @@ class TagsConfig:
         return new
 
 
-class TreeNode(dict):
+class TreeNode:
     """
     This object defines a tree node and can be used to define the structure.
 
@@ -107,83 +224,24 @@ class TreeNode(dict):
     `checked`, `opened` and `tags` are updated in this case and a new object is returned.
     """
 
-    @property
-    def label(self) -> str:
-        """ttk.Treeview named it 'text'"""
-        return self["label"]
-
-    @label.setter
-    def label(self, val):
-        """ttk.Treeview named it 'text'"""
-        self["label"] = val
-
-    @property
-    def values(self) -> Any:
-        return self["values"]
-
-    @values.setter
-    def values(self, val):
-        self["values"] = val
-
-    @property
-    def children(self) -> tuple[TreeNode]:
-        return self["children"]
-
-    @children.setter
-    def children(self, val):
-        self["children"] = val
-
-    @property
-    def iid(self) -> str:
-        return self["iid"]
-
-    @iid.setter
-    def iid(self, val):
-        self["iid"] = val
-
-    @property
-    def iid_path(self) -> str:
-        return self["iid_path"]
-
-    @iid_path.setter
-    def iid_path(self, val):
-        self["iid_path"] = val
-
-    @property
-    def checked(self) -> bool | None:
-        """None indicates checked children's"""
-        return self["checked"]
-
-    @checked.setter
-    def checked(self, val):
-        """None indicates checked children's"""
-        self["checked"] = val
-
-    @property
-    def opened(self) -> bool:
-        return self["opened"]
-
-    @opened.setter
-    def opened(self, val):
-        self["opened"] = val
-
-    @property
-    def tags(self) -> tuple[str, ...]:
-        return self["tags"]
-
-    @tags.setter
-    def tags(self, val):
-        self["tags"] = val
-
-    parent: TreeNode = None
-
-    @property
-    def iid_sep(self) -> str:
-        return self["iid_sep"]
-
-    @iid_sep.setter
-    def iid_sep(self, val):
-        self["iid_sep"] = val
+    __slots__ = (
+        "label", "values", "children", "iid", "iid_path", "checked", "opened", "tags", "iid_sep", "parent",
+        "_index", "_iid_index",
+    )
+
+    label: str  # ttk.Treeview named it 'text'
+    values: Any
+    children: tuple[TreeNode]
+    iid: str
+    iid_path: str
+    checked: bool | None  # None indicates checked children's
+    opened: bool
+    tags: tuple[str, ...]
+    iid_sep: str
+    parent: TreeNode | None
+    # set by compile()
+    _index: dict[str, TreeNode] | None
+    _iid_index: dict[str, TreeNode] | None
 
     def __init__(
             self,
@@ -197,7 +255,6 @@ class TreeNode(dict):
             iid_sep: str = ".",
             iid_path: str = ""
     ):
-        dict.__init__(self)
         self.label = label
         self.values = values
         self.children = children
@@ -207,6 +264,24 @@ class TreeNode(dict):
         self.tags = tags
         self.iid_path = iid_path
         self.iid_sep = iid_sep
+        self.parent = self._index = self._iid_index = None
+
+    def __repr__(self) -> str:
+        return "%s(%r)" % (type(self).__name__, self.as_dict())
+
+    def as_dict(self) -> dict:
+        """Return the attributes as dict (recursive), e.g. for the JSON serialization."""
+        return dict(
+            label=self.label,
+            values=self.values,
+            children=[c.as_dict() for c in self.children],
+            iid=self.iid,
+            checked=self.checked,
+            opened=self.opened,
+            tags=self.tags,
+            iid_path=self.iid_path,
+            iid_sep=self.iid_sep,
+        )
 
     def from_treeitem(
             self,
@@ -237,26 +312,44 @@ class TreeNode(dict):
 
     def compile(self) -> set[bool, bool] | set[bool] | set:
         """Compile the `iid_path`'s and check-states."""
-
-        def make(node: TreeNode):
-            checks = set()
-            for _child in node:
-                if not _child.iid_path:
-                    _child.iid_path = node.iid_path + node.iid_sep + _child.iid
+        index = self._index = dict()
+        iid_index = self._iid_index = dict()
+
+        order = list()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is not self:
+                parent = node.parent
+                if not node.iid_path:
+                    node.iid_path = parent.iid_path + parent.iid_sep + node.iid
+                index.setdefault(node.iid_path, node)
+                iid_index.setdefault(node.iid, node)
+                if node.checked is None:
+                    node.checked = parent.checked
+            order.append(node)
+            for _child in node.children:
                 _child.parent = node
-                if _child.checked is None:
-                    _child.checked = node.checked
-                checks.add(_child.checked or False)
-                checks |= make(_child)
-            if len(checks) == 2:
+            stack.extend(reversed(node.children))
+
+        # bit 1: unchecked, bit 2: checked (in the subtree)
+        masks = dict()
+        mask = 0
+        for node in reversed(order):
+            mask = 0
+            for _child in node.children:
+                mask |= masks[id(_child)]
+            own = 2 if node.checked else 1
+            if mask == 3:
                 node.checked = None
-            elif len(checks) == 1:
-                node.checked = checks.pop()
+            elif mask:
+                node.checked = mask == 2
             elif node.checked is None:
                 node.checked = False
-            return checks
+            # only a mixed subtree is passed on beside the own state
+            masks[id(node)] = own | (mask if mask == 3 else 0)
 
-        return make(self)
+        return {False, True} if mask == 3 else set()
 
     def __iter__(self) -> Iterable[TreeNode]:
         """iter(self.children)"""
@@ -264,29 +357,19 @@ class TreeNode(dict):
 
     def children_iid_paths_linear_iter(self) -> Generator[str]:
         """Generate all `iid_path`'s of children's recursive and unstructured."""
-
-        def gen():
-            yield self.iid_path
-            for c in self.children:
-                c: TreeNode
-                ci = c.children_iid_paths_linear_iter()
-                for i in ci:
-                    yield i
-
-        return gen()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node.iid_path
+            stack.extend(reversed(node.children))
 
     def children_linear_iter(self) -> Generator[TreeNode]:
         """Generate all children's recursive and unstructured."""
-
-        def gen():
-            yield self
-            for c in self.children:
-                c: TreeNode
-                ci = c.children_linear_iter()
-                for i in ci:
-                    yield i
-
-        return gen()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
 
     def child_from_dicts(self, child_dicts: Iterable[dict]):
         """Set `children` from attribute dicts (recursive)."""
@@ -295,27 +378,37 @@ class TreeNode(dict):
     @classmethod
     def from_dict(cls, __dict: dict) -> TreeNode:
         """Create a new :class:`TreeNode` from attribute dict (recursive)."""
-        return TreeNode(
-            __dict["label"],
-            __dict["values"],
-            *(TreeNode.from_dict(cd) for cd in __dict["children"]),
-            iid=__dict["iid"],
-            checked=__dict["checked"],
-            opened=__dict["opened"],
-            tags=__dict["tags"],
-            iid_path=__dict["iid_path"]
-        )
+        order = list()
+        stack = [__dict]
+        while stack:
+            d = stack.pop()
+            order.append(d)
+            stack.extend(d["children"])
+        # parents are ordered before their children's, so build backwards
+        nodes = dict()
+        for d in reversed(order):
+            nodes[id(d)] = TreeNode(
+                d["label"],
+                d["values"],
+                *(nodes[id(cd)] for cd in d["children"]),
+                iid=d["iid"],
+                checked=d["checked"],
+                opened=d["opened"],
+                tags=d["tags"],
+                iid_path=d["iid_path"]
+            )
+        return nodes[id(__dict)]
 
     def get_children(self, iid_path: str, depth: bool = True) -> TreeNode:
         """Find a children of this :class:`TreeNode` [recursive]."""
         if depth:
-            for c in self.children:
+            if self._index is not None:
+                return self._index[iid_path]
+            nodes = self.children_linear_iter()
+            next(nodes)
+            for c in nodes:
                 if c.iid_path == iid_path:
                     return c
-                try:
-                    return c.get_children(iid_path)
-                except KeyError:
-                    pass
         else:
             for c in self.children:
                 if c.iid_path == iid_path:
@@ -329,13 +422,13 @@ class TreeNode(dict):
         May be unexpected result.
         """
         if depth:
-            for c in self.children:
+            if self._iid_index is not None:
+                return self._iid_index[iid]
+            nodes = self.children_linear_iter()
+            next(nodes)
+            for c in nodes:
                 if c.iid == iid:
                     return c
-                try:
-                    return c.get_children_only_by_iid(iid)
-                except KeyError:
-                    pass
         else:
             for c in self.children:
                 if c.iid == iid:
@@ -371,6 +464,7 @@ class SelectTree(ttk.Treeview):
     - expand_for_match
     - remove_match_tags
     - toggle_check
+    - bulk_check
     - toggle_single_check
     - get_checked
     - is_checked
@@ -378,8 +472,10 @@ class SelectTree(ttk.Treeview):
     - element_by_event
     - event_points_to
     - iid_path_by_event
+    - identify_image_row
     - iid_path_by_selected
     - get_linear_iid_path_list
+    - iter_linear_iid_paths
     - set_selection
     - set_width
     """
@@ -389,6 +485,16 @@ class SelectTree(ttk.Treeview):
     all_sector_iids: tuple[str, ...]
     entry_iids: tuple[str, ...]
     structure: TreeNode
+    _parent_of: dict[str, str]
+    _children_of: dict[str, list[str]]
+    _linear_iids: list[str]
+    _linear_end: dict[str, int]
+    _linear_pos: dict[str, int]
+    _labels: list[str]  # parallel to _linear_iids
+    _matches_cache: dict[tuple[str, bool, bool], tuple[list[str], list[int]]]
+    _tag_state: dict[str, dict[Literal["others", "c", "m"], tuple[str, ...] | str | None]]
+    # element name -> "image", "text", "indicator" or None (Tk uses a small fixed set of names)
+    _element_kinds: dict[str, str | None] = dict()
 
     def __init__(
             self,
@@ -407,36 +513,46 @@ class SelectTree(ttk.Treeview):
 
         self.load(structure)
 
-    def _change_check_tag(self, iid: str, tag: str):
-        tags = set(self.item(iid, "tags"))
-        for t in tags:
-            if t.startswith("c-"):
-                tags.remove(t)
-                break
-        tags.add(tag)
-        self.item(iid, tags=tuple(tags))
+    @cached_property
+    def _all_sector_iids_set(self) -> frozenset[str]:
+        return frozenset(self.all_sector_iids)
+
+    @cached_property
+    def _search_buffer(self) -> tuple[bytes, list[int]] | None:
+        # the labels in one buffer for hyperscan
+        return _hs_buffer(self._labels)
+
+    @staticmethod
+    def _tags(st: dict) -> tuple[str, ...]:
+        if st["m"]:
+            return st["others"] + (st["c"], st["m"])
+        return st["others"] + (st["c"],)
+
+    def _set_tags(self, iid: str, st: dict):
+        self.item(iid, tags=self._tags(st))
+
+    def _foreach(self, names: str | tuple[str, ...], values: Iterable, script: str):
+        # Execute the `script` (with substitutions of `names`) in a single Tcl call.
+        if values:
+            self.tk.call("apply", _FOREACH, names, tuple(values), script)
 
     def _reset_match_tag(self, iid: str):
-        tags = set(self.item(iid, "tags"))
-        for t in tags:
-            if t.startswith("m-"):
-                tags.remove(t)
-                break
-        self.item(iid, tags=tuple(tags))
+        st = self._tag_state[iid]
+        if st["m"]:
+            st["m"] = None
+            self._matches_cache.clear()
+            self._set_tags(iid, st)
 
     def _add_match_tag(self, iid: str, tag: str):
-        tags = set(self.item(iid, "tags"))
-        for t in tags:
-            if t.startswith("m-"):
-                tag = "m-%s%s" % (
-                    str(int(t[2]) | int(tag[2])),
-                    t[3:]
-                )
-                tags.remove(t)
-                break
-
-        tags.add(tag)
-        self.item(iid, tags=tuple(tags))
+        st = self._tag_state[iid]
+        if t := st["m"]:
+            tag = "m-%s%s" % (
+                str(int(t[2]) | int(tag[2])),
+                t[3:]
+            )
+        st["m"] = tag
+        self._matches_cache.clear()
+        self._set_tags(iid, st)
 
     def dump(self, start_iid: str = "") -> TreeNode:
         """Create a deepcopy from the current structure started from `start_iid`."""
@@ -457,16 +573,41 @@ class SelectTree(ttk.Treeview):
         top_sector_iids = list()
         sub_sector_iids = list()
         entry_iids = list()
+        tag_state = self._tag_state = dict()
+        self._matches_cache = dict()
+        linear_iids = self._linear_iids = list()
+        linear_end = self._linear_end = dict()
+        linear_pos = self._linear_pos = dict()
+        parent_of = self._parent_of = dict()
+        labels = self._labels = list()
+        children_of = self._children_of = {"": []}
+        # the insert arguments of all items in tree order
+        rows = list()
 
         self.structure = TreeNode.ROOT(structure)
 
         self.structure.compile()
 
+        type_tags = (TagsConfig.t_entry, TagsConfig.t_sector, TagsConfig.t_top_sector, TagsConfig.t_sub_sector)
+
         def make(struc, parent=""):
             for _node in struc:
                 _node: TreeNode
                 iid = _node.iid_path
-                tags = _node.tags
+                tags = list()
+                mtag = None
+                for t in _node.tags:
+                    # the state and type tags of a dumped structure
+                    if t.startswith("m-"):
+                        mtag = t
+                    elif not (t.startswith("c-") or t in type_tags or t in tags):
+                        tags.append(t)
+                tags = tuple(tags)
+                linear_pos[iid] = len(linear_iids)
+                linear_iids.append(iid)
+                parent_of[iid] = parent
+                labels.append(str(_node.label))
+                children_of[parent].append(iid)
                 if _node.children:
                     if _node.parent.parent:
                         tags += (TagsConfig.t_sub_sector,)
@@ -475,48 +616,41 @@ class SelectTree(ttk.Treeview):
                         tags += (TagsConfig.t_top_sector,)
                         top_sector_iids.append(iid)
                     if _node.checked is None:
-                        tags += (TagsConfig.c_ccstate_sector,)
+                        ctag = TagsConfig.c_ccstate_sector
                     elif _node.checked:
-                        tags += (TagsConfig.c_check_sector,)
+                        ctag = TagsConfig.c_check_sector
                     else:
-                        tags += (TagsConfig.c_uncheck_sector,)
-
-                    self.insert(
-                        parent,
-                        text=_node.label,
-                        values=_node.values,
-                        index="end",
-                        iid=iid,
-                        tags=tags,
-                        open=_node.opened
-                    )
+                        ctag = TagsConfig.c_uncheck_sector
+                    tag_state[iid] = {"others": tags, "c": ctag, "m": mtag}
+                    rows.extend((parent, iid, _node.label, _node.values, self._tags(tag_state[iid]), _node.opened))
 
+                    children_of[iid] = list()
                     make(_node.children, iid)
+                    linear_end[iid] = len(linear_iids)
                 else:
                     tags += (TagsConfig.t_entry,)
                     if _node.checked:
-                        tags += (TagsConfig.c_check_entry,)
+                        ctag = TagsConfig.c_check_entry
                     else:
-                        tags += (TagsConfig.c_uncheck_entry,)
-
-                    self.insert(
-                        parent,
-                        text=_node.label,
-                        values=_node.values,
-                        index="end",
-                        iid=iid,
-                        tags=tags,
-                        open=_node.opened
-                    )
+                        ctag = TagsConfig.c_uncheck_entry
+                    tag_state[iid] = {"others": tags, "c": ctag, "m": mtag}
+                    rows.extend((parent, iid, _node.label, _node.values, self._tags(tag_state[iid]), _node.opened))
 
                     entry_iids.append(iid)
 
         make(self.structure)
+        self._foreach(
+            ("p", "i", "t", "v", "g", "o"),
+            rows,
+            "%s insert $p end -id $i -text $t -values $v -tags $g -open $o" % self._w
+        )
 
         self.top_sector_iids = tuple(top_sector_iids)
         self.sub_sector_iids = tuple(sub_sector_iids)
         self.all_sector_iids = self.top_sector_iids + self.sub_sector_iids
         self.entry_iids = tuple(entry_iids)
+        self.__dict__.pop("_all_sector_iids_set", None)
+        self.__dict__.pop("_search_buffer", None)
 
     def get(self, iid_path: str) -> TreeNode:
         """Return a copy with actual states of the entry on `iid_path`."""
@@ -530,37 +664,49 @@ class SelectTree(ttk.Treeview):
         )
 
     def search(self, pattern: str | Pattern, parent_iid: str = "") -> bool:
-        """Search for `pattern` started from `parent_iid`."""
+        """Search for `pattern` (or any compiled pattern object with a ``search`` method) started from `parent_iid`."""
         self.remove_match_tags()
 
-        match = False
-
-        def _search(_iid=parent_iid):
-            nonlocal match
-            children = self.get_children(_iid)
-            for _iid in children:
-                if search(pattern, self.item(_iid, "text")):
-
-                    match = True
-
-                    if _iid in self.all_sector_iids:
-                        self._add_match_tag(_iid, TagsConfig.m_match_sector)
-                    else:
-                        self._add_match_tag(_iid, TagsConfig.m_match_entry)
-
-                    def parentref(__iid=_iid):
-                        parent = self.parent(__iid)
-                        if parent:
-                            self._add_match_tag(parent, TagsConfig.m_hint_sector)
-                            parentref(parent)
-
-                    parentref()
-
-                _search(_iid)
-
-        _search()
+        if isinstance(pattern, str):
+            pattern = compile(pattern)
+
+        start, end = self._linear_range(parent_iid)
+        found = None
+        if hyperscan is not None and isinstance(pattern, Pattern) and isinstance(pattern.pattern, str):
+            db = _hs_database(pattern.pattern, pattern.flags)
+            if db is not None and (buffer := self._search_buffer) is not None:
+                labels = self._labels
+                found = [
+                    self._linear_iids[i]
+                    for i in _hs_search(db, *buffer, start, end, lambda i: pattern.search(labels[i]) is not None)
+                ]
+        if found is None:
+            iids = self._linear_iids[start:end]
+            labels = self._labels[start:end]
+            search = pattern.search
+            found = [iid for iid, label in zip(iids, labels) if search(label)]
+
+        # 1: match, 2: hint
+        states = dict()
+        for iid in found:
+            states[iid] = states.get(iid, 0) | 1
+            parent = self._parent_of[iid]
+            while parent and not states.get(parent, 0) & 2:
+                states[parent] = states.get(parent, 0) | 2
+                parent = self._parent_of[parent]
+
+        updates = list()
+        for iid, state in states.items():
+            st = self._tag_state[iid]
+            if iid in self._all_sector_iids_set:
+                st["m"] = (TagsConfig.m_match_sector, TagsConfig.m_hint_sector, TagsConfig.m_match_and_hint_sector)[state - 1]
+            else:
+                st["m"] = TagsConfig.m_match_entry
+            updates += (iid, self._tags(st))
+        self._matches_cache.clear()
+        self._foreach(("i", "t"), updates, "%s item $i -tags $t" % self._w)
 
-        return match
+        return bool(states)
 
     def get_matches(self, parent_iid: str = "", scip_hints: bool = True, scip_sectors: bool = False) -> list[TreeNode]:
         """
@@ -573,38 +719,28 @@ class SelectTree(ttk.Treeview):
         - `scip_sectors`
             Skips all sectors.
         """
-        matches = list()
+        return [self.get(iid) for iid in self._get_match_iids(parent_iid, scip_hints, scip_sectors)[0]]
+
+    def _get_match_iids(self, parent_iid: str, scip_hints: bool, scip_sectors: bool) -> tuple[list[str], list[int]]:
+        # The matches and their linear positions; memoized until the match tags change.
+        key = (parent_iid, bool(scip_hints), bool(scip_sectors))
+        try:
+            return self._matches_cache[key]
+        except KeyError:
+            pass
         if scip_sectors:
-            def find(_iid=parent_iid):
-                children = self.get_children(_iid)
-                for _iid in children:
-                    itm = self.get(_iid)
-                    if TagsConfig.m_match_entry in itm.tags:
-                        matches.append(itm)
-                    else:
-                        find(_iid)
+            tags = (TagsConfig.m_match_entry,)
         elif scip_hints:
-            def find(_iid=parent_iid):
-                children = self.get_children(_iid)
-                for _iid in children:
-                    itm = self.get(_iid)
-                    if (
-                            TagsConfig.m_match_entry in itm.tags
-                            or TagsConfig.m_match_sector in itm.tags
-                            or TagsConfig.m_match_and_hint_sector in itm.tags
-                    ):
-                        matches.append(itm)
-                    find(_iid)
+            tags = (TagsConfig.m_match_entry, TagsConfig.m_match_sector, TagsConfig.m_match_and_hint_sector)
         else:
-            def find(_iid=parent_iid):
-                children = self.get_children(_iid)
-                for _iid in children:
-                    itm = self.get(_iid)
-                    for t in itm.tags:
-                        if t.startswith("m-"):
-                            matches.append(itm)
-                    find(_iid)
-        find()
+            tags = None
+        matches = list()
+        for iid in self.iter_linear_iid_paths(parent_iid):
+            if m := self._tag_state[iid]["m"]:
+                if tags is None or m in tags:
+                    matches.append(iid)
+        linear_pos = self._linear_pos
+        self._matches_cache[key] = matches = (matches, [linear_pos[iid] for iid in matches])
         return matches
 
     def get_next_match(
@@ -632,35 +768,25 @@ class SelectTree(ttk.Treeview):
         - `back_to_begin`
             Returns the first/last match when the end of the order is reached. If left to False and matches are present, None is returned.
         """
-        if matches := self.get_matches(
-                parent_iid_path, scip_hints, scip_sectors
-        ):
-            start_iid_path: TreeNode | str
+        matches_iids, positions = self._get_match_iids(parent_iid_path, scip_hints, scip_sectors)
+        if matches_iids:
             if start_iid_path is None:
                 start_iid_path = self.iid_path_by_selected()
+            pos = self._linear_index(start_iid_path)
             if reverse:
-                matches.reverse()
-            matches_iids = [i.iid_path for i in matches]
-            try:
-                return matches[matches_iids.index(start_iid_path) + 1]
-            except IndexError:
-                if back_to_begin:
-                    return matches[0]
-                else:
-                    return
-            except ValueError:
-                main_list = self.get_linear_iid_path_list()
-                if reverse:
-                    main_list.reverse()
-                for i in main_list[main_list.index(start_iid_path):]:
-                    try:
-                        return matches[matches_iids.index(i)]
-                    except ValueError:
-                        pass
-                if back_to_begin:
-                    return matches[0]
-                else:
-                    return
+                i = bisect_left(positions, pos) - 1
+                if i >= 0:
+                    return self.get(matches_iids[i])
+                i = -1
+            else:
+                i = bisect_right(positions, pos)
+                if i < len(matches_iids):
+                    return self.get(matches_iids[i])
+                i = 0
+            if back_to_begin:
+                return self.get(matches_iids[i])
+            else:
+                return
         else:
             return False
 
@@ -712,29 +838,52 @@ class SelectTree(ttk.Treeview):
 
     def expand_for_match(self) -> bool:
         """Expand the tree to show search matches. Return whether matches are present."""
-
-        def x(tags):
-            for t in tags:
-                if t.startswith("m-"):
-                    return True
-
-        return self.expand_for_tag(x)
+        matches = [iid for iid, st in self._tag_state.items() if st["m"]]
+        self._foreach("i", matches, "%s item $i -open 1" % self._w)
+        return bool(matches)
 
     def remove_match_tags(self, parent_iid: str = ""):
         """Purge search-tags, started from `parent_iid` (recursive)."""
+        if parent_iid:
+            iids = list()
 
-        def rm(_iid=parent_iid):
-            children = self.get_children(_iid)
-            for _iid in children:
-                self._reset_match_tag(_iid)
-                rm(_iid)
+            def rm(_iid=parent_iid):
+                for _iid in self._children_of.get(_iid, ()):
+                    iids.append(_iid)
+                    rm(_iid)
 
-        rm()
+            rm()
+        else:
+            iids = self._tag_state.keys()
+
+        updates = list()
+        for iid in iids:
+            st = self._tag_state[iid]
+            if st["m"]:
+                st["m"] = None
+                updates += (iid, self._tags(st))
+        self._matches_cache.clear()
+        self._foreach(("i", "t"), updates, "%s item $i -tags $t" % self._w)
+
+    def _sector_check_tag(self, iid: str) -> str:
+        # the check tag of the sector `iid` derived from the check tags of its children
+        children_tags = tuple(self._tag_state[c]["c"] for c in self._children_of[iid])
+        states = set((t == TagsConfig.c_check_entry or t == TagsConfig.c_check_sector) for t in children_tags)
+        if all(states):
+            return TagsConfig.c_check_sector
+        elif len(states) == 1:
+            if TagsConfig.c_ccstate_sector in children_tags:
+                return TagsConfig.c_ccstate_sector
+            else:
+                return TagsConfig.c_uncheck_sector
+        else:
+            return TagsConfig.c_ccstate_sector
 
     def toggle_check(self, check: bool = None, iid_path: str = "") -> bool:
         """Toggle or set the check state of entry on `iid_path` and return whether the entry is checked."""
+        updates = list()
         if iid_path:
-            if iid_path in self.all_sector_iids:
+            if iid_path in self._all_sector_iids_set:
                 tag_check = TagsConfig.c_check_sector
                 tag_uncheck = TagsConfig.c_uncheck_sector
             else:
@@ -742,7 +891,7 @@ class SelectTree(ttk.Treeview):
                 tag_uncheck = TagsConfig.c_uncheck_entry
 
             if check is None:
-                check = tag_check not in self.item(iid_path, "tags")
+                check = self._tag_state[iid_path]["c"] != tag_check
 
             if check:
                 tag = tag_check
@@ -750,28 +899,17 @@ class SelectTree(ttk.Treeview):
                 tag = tag_uncheck
 
             def __toggle_parents(_iid, _tag):
-                self._change_check_tag(_iid, _tag)
-                parent = self.parent(_iid)
+                st = self._tag_state[_iid]
+                st["c"] = _tag
+                updates.extend((_iid, self._tags(st)))
+                parent = self._parent_of[_iid]
                 if parent:
-                    children_tags = tuple(self.item(c, "tags") for c in self.get_children(parent))
-                    states = set((TagsConfig.c_check_entry in t or TagsConfig.c_check_sector in t) for t in children_tags)
-                    if all(states):
-                        _tag = TagsConfig.c_check_sector
-                    elif len(states) == 1:
-                        for t in children_tags:
-                            if TagsConfig.c_ccstate_sector in t:
-                                _tag = TagsConfig.c_ccstate_sector
-                                break
-                        else:
-                            _tag = TagsConfig.c_uncheck_sector
-                    else:
-                        _tag = TagsConfig.c_ccstate_sector
-                    __toggle_parents(parent, _tag)
+                    __toggle_parents(parent, self._sector_check_tag(parent))
 
             __toggle_parents(iid_path, tag)
 
         elif check is None:
-            check = not all((TagsConfig.c_check_sector in self.item(c, "tags")) for c in self.get_children(iid_path))
+            check = not all((self._tag_state[c]["c"] == TagsConfig.c_check_sector) for c in self._children_of[iid_path])
 
         if check:
             tag_entry = TagsConfig.c_check_entry
@@ -780,19 +918,63 @@ class SelectTree(ttk.Treeview):
             tag_entry = TagsConfig.c_uncheck_entry
             tag_sector = TagsConfig.c_uncheck_sector
 
-        def __toggle_children(_iid):
-            children = self.get_children(_iid)
-            for _iid in children:
-                if _iid in self.all_sector_iids:
-                    self._change_check_tag(_iid, tag_sector)
-                else:
-                    self._change_check_tag(_iid, tag_entry)
-                __toggle_children(_iid)
-
-        __toggle_children(iid_path)
+        # the descendants are the linear slice of `iid_path`
+        start, end = self._linear_range(iid_path)
+        sectors = self._all_sector_iids_set
+        tag_state = self._tag_state
+        for _iid in self._linear_iids[start:end]:
+            st = tag_state[_iid]
+            tag = tag_sector if _iid in sectors else tag_entry
+            if st["c"] != tag:
+                st["c"] = tag
+                updates.extend((_iid, self._tags(st)))
+        self._foreach(("i", "t"), updates, "%s item $i -tags $t" % self._w)
 
         return check
 
+    def bulk_check(self, iid_paths: Iterable[str]) -> None:
+        """
+        Check the entries on `iid_paths` and their children's.
+
+        Equivalent to ``toggle_check(True, iid_path)`` for each, but the states of the parents are updated once.
+        """
+        tag_state = self._tag_state
+        sectors = self._all_sector_iids_set
+        linear_iids = self._linear_iids
+        changed = dict()
+        parents = set()
+
+        for iid_path in dict.fromkeys(iid_paths):
+            if iid_path:
+                parent = self._parent_of[iid_path]
+                while parent and parent not in parents:
+                    parents.add(parent)
+                    parent = self._parent_of[parent]
+                start, end = self._linear_range(iid_path)
+                # the entry itself and its children's
+                iids = linear_iids[start - 1:end]
+            else:
+                iids = linear_iids
+            for _iid in iids:
+                st = tag_state[_iid]
+                tag = TagsConfig.c_check_sector if _iid in sectors else TagsConfig.c_check_entry
+                if st["c"] != tag:
+                    st["c"] = tag
+                    changed[_iid] = st
+
+        # children's before their parents
+        for parent in sorted(parents, key=self._linear_pos.__getitem__, reverse=True):
+            st = tag_state[parent]
+            tag = self._sector_check_tag(parent)
+            if st["c"] != tag:
+                st["c"] = tag
+                changed[parent] = st
+
+        updates = list()
+        for _iid, st in changed.items():
+            updates += (_iid, self._tags(st))
+        self._foreach(("i", "t"), updates, "%s item $i -tags $t" % self._w)
+
     def toggle_single_check(self, check: bool = None, iid_path: str = "") -> bool:
         """
         Purge all check states and toggle or set the check state of the entry on `iid_path`.
@@ -808,26 +990,25 @@ class SelectTree(ttk.Treeview):
     def get_checked(self) -> list[TreeNode]:
         """Return all checked entries."""
         checked = list()
+        # the top level and the partially checked sectors
+        reached = {""}
 
-        def get(iid):
-            nonlocal checked
-            item = self.item(iid)
-            tags = item["tags"]
-            if TagsConfig.c_check_entry in tags or TagsConfig.c_check_sector in tags:
-                checked.append(self.structure.from_treeitem(iid, item["open"], tags, True))
-            elif TagsConfig.c_ccstate_sector in tags:
-                for child in self.get_children(iid):
-                    get(child)
-
-        for sector in self.get_children(""):
-            get(sector)
+        for iid, st in self._tag_state.items():
+            if self._parent_of[iid] in reached:
+                if st["c"] == TagsConfig.c_check_entry or st["c"] == TagsConfig.c_check_sector:
+                    checked.append(self.structure.from_treeitem(iid, self.item(iid, "open"), self._tags(st), True))
+                elif st["c"] == TagsConfig.c_ccstate_sector:
+                    reached.add(iid)
 
         return checked
 
     def is_checked(self, iid_path: str) -> bool:
         """Return whether the entry on `iid_path` is checked."""
-        tags = self.item(iid_path, "tags")
-        return TagsConfig.c_check_entry in tags or TagsConfig.c_check_sector in tags
+        st = self._tag_state.get(iid_path)
+        if st is None:
+            tags = self.item(iid_path, "tags")
+            return TagsConfig.c_check_entry in tags or TagsConfig.c_check_sector in tags
+        return st["c"] == TagsConfig.c_check_entry or st["c"] == TagsConfig.c_check_sector
 
     def toggle_recursive_expand(self, start_iid: str = "", expand: bool = None) -> bool:
         """
@@ -844,9 +1025,11 @@ class SelectTree(ttk.Treeview):
                         break
             else:
                 expand = not self.item(start_iid, "open")
-        for sector in self.all_sector_iids:
-            if sector.startswith(start_iid):
-                self.item(sector, open=expand)
+        self._foreach(
+            "i",
+            [sector for sector in self.all_sector_iids if sector.startswith(start_iid)],
+            "%s item $i -open %d" % (self._w, bool(expand))
+        )
         return expand
 
     @staticmethod
@@ -861,14 +1044,18 @@ class SelectTree(ttk.Treeview):
         Otherwise, return the name of the element.
         """
         element = self.element_by_event(event)
-        if "image" in element:
-            e = "image"
-        elif "text" in element:
-            e = "text"
-        elif "indicator" in element:
-            e = "indicator"
-        else:
-            e = None
+        try:
+            e = self._element_kinds[element]
+        except KeyError:
+            if "image" in element:
+                e = "image"
+            elif "text" in element:
+                e = "text"
+            elif "indicator" in element:
+                e = "indicator"
+            else:
+                e = None
+            self._element_kinds[element] = e
         if ref is not None:
             return (e or "") == ref
         else:
@@ -878,6 +1065,11 @@ class SelectTree(ttk.Treeview):
         """self.identify_row(event.y)"""
         return self.identify_row(event.y)
 
+    def identify_image_row(self, event) -> str | None:
+        """Return the `iid_path` of the row if the event points to the image (check box) element, otherwise None."""
+        if self.event_points_to(event, "image"):
+            return self.identify_row(event.y)
+
     def iid_path_by_selected(self) -> str:
         """self.selection()[0]"""
         if s := self.selection():
@@ -886,17 +1078,29 @@ class SelectTree(ttk.Treeview):
 
     def get_linear_iid_path_list(self, parent_iid: str = "") -> list[str]:
         """Return an unstructured list of child-iid_path's started from `start_id` (recursive)."""
-        _list = list()
-
-        def add(_iid=parent_iid):
-            _list.append(_iid)
-            children = self.get_children(_iid)
-            for _iid in children:
-                _list.append(_iid)
-                add(_iid)
-
-        add()
-        return _list[1:]
+        start, end = self._linear_range(parent_iid)
+        return self._linear_iids[start:end]
+
+    def iter_linear_iid_paths(self, parent_iid: str = "") -> Generator[str]:
+        """Generate the unstructured child-iid_path's started from `parent_iid` (recursive) without building a list."""
+        start, end = self._linear_range(parent_iid)
+        linear_iids = self._linear_iids
+        for i in range(start, end):
+            yield linear_iids[i]
+
+    def _linear_range(self, parent_iid: str) -> tuple[int, int]:
+        # the slice of the children of `parent_iid` in _linear_iids
+        if not parent_iid:
+            return 0, len(self._linear_iids)
+        start = self._linear_index(parent_iid) + 1
+        return start, self._linear_end.get(parent_iid, start)
+
+    def _linear_index(self, iid: str) -> int:
+        # like self._linear_iids.index(iid)
+        try:
+            return self._linear_pos[iid]
+        except KeyError:
+            raise ValueError("%r is not in list" % iid) from None
 
     def set_selection(self, node: TreeNode) -> None:
         """self.selection_set(node.iid_path)"""
@@ -905,9 +1109,9 @@ class SelectTree(ttk.Treeview):
     def set_width(self, width: int, minwidth: int = None) -> None:
         """self.column("#0", width=width, minwidth=minwidth)"""
         if minwidth:
-            self.column("#0", width=width, minwidth=minwidth)
+            self.tk.call(self._w, "column", "#0", "-width", width, "-minwidth", minwidth)
         else:
-            self.column("#0", width=width)
+            self.tk.call(self._w, "column", "#0", "-width", width)
 
 
 MAN_PAGE = (
@@ -1075,54 +1279,20 @@ class SelectTreeWidget(ttk.Frame):
         self.man_pages = man_pages
         self.man_title = man_title
         self.mode = mode
-        if self.mode == "multi":
-
-            def check(e, iid=None):
-                if iid:
-                    self.tree.toggle_check(iid_path=iid)
-                elif self.tree.event_points_to(e, "image"):
-                    self.tree.toggle_check(iid_path=self.tree.iid_path_by_event(e))
-
-        elif self.mode == "single":
-
-            def check(e, iid=None):
-                if iid:
-                    self.tree.toggle_single_check(iid_path=iid)
-                elif self.tree.event_points_to(e, "image"):
-                    self.tree.toggle_single_check(iid_path=self.tree.iid_path_by_event(e))
-
-        elif self.mode == "single entry":
-
-            def check(e, iid=None):
-                if iid:
-                    if iid not in self.tree.all_sector_iids:
-                        self.tree.toggle_single_check(iid_path=iid)
-                elif self.tree.event_points_to(e, "image"):
-                    iid = self.tree.iid_path_by_event(e)
-                    if iid not in self.tree.all_sector_iids:
-                        self.tree.toggle_single_check(iid_path=iid)
-
-        elif self.mode == "single sector":
-
-            def check(e, iid=None):
-                if iid:
-                    if iid in self.tree.all_sector_iids:
-                        self.tree.toggle_single_check(iid_path=iid)
-                elif self.tree.event_points_to(e, "image"):
-                    iid = self.tree.iid_path_by_event(e)
-                    if iid in self.tree.all_sector_iids:
-                        self.tree.toggle_single_check(iid_path=iid)
-
-        else:
-            raise ValueError(self.mode)
-
-        self.toggle_check = check
+        try:
+            single, sectors = self._check_modes[self.mode]
+        except KeyError:
+            raise ValueError(self.mode) from None
+        self.toggle_check = partial(self._check, single=single, sectors=sectors)
 
         self.master = master
         ttk.Frame.__init__(self, master)
         self.widget_frame = ttk.Frame(self)
 
-        _folder = str(Path(__file__).parent)
+        checkbox = {
+            name: tk.PhotoImage(data=data, format="png", master=self.widget_frame)
+            for name, data in _CHECKBOX_PNG.items()
+        }
 
         self.tree = SelectTree(
             *structure,
@@ -1131,21 +1301,19 @@ class SelectTreeWidget(ttk.Frame):
                 match_sector={'background': "#489F59", 'foreground': "black"},
                 match_hint_sector={'background': "#F9F46E"},
                 match_hint_and_match_sector={'background': "#70F05F"},
-                check_entry=dict(image=tk.PhotoImage(file=_folder + "/dat/checkbox_checked18.png", master=self.widget_frame)),
-                uncheck_entry=dict(image=tk.PhotoImage(file=_folder + "/dat/checkbox_unchecked18.png", master=self.widget_frame)),
-                check_sector=dict(image=tk.PhotoImage(file=_folder + "/dat/checkbox_checked18.png", master=self.widget_frame)),
-                uncheck_sector=dict(image=tk.PhotoImage(file=_folder + "/dat/checkbox_unchecked18.png", master=self.widget_frame)),
-                ccstate_sector=dict(image=tk.PhotoImage(file=_folder + "/dat/checkbox_hover18.png", master=self.widget_frame)),
+                check_entry=dict(image=checkbox["checked"]),
+                uncheck_entry=dict(image=checkbox["unchecked"]),
+                check_sector=dict(image=checkbox["checked"]),
+                uncheck_sector=dict(image=checkbox["unchecked"]),
+                ccstate_sector=dict(image=checkbox["hover"]),
             ) | tags_config_update,
             master=self.widget_frame
         )
-        for iid in checked_iids:
-
-            if isinstance(iid, TreeNode):
-                for _iid in iid.children_iid_paths_linear_iter():
-                    self.tree.toggle_check(True, _iid)
-            else:
-                self.tree.toggle_check(True, iid)
+        self.tree.bulk_check(
+            _iid
+            for iid in checked_iids
+            for _iid in (iid.children_iid_paths_linear_iter() if isinstance(iid, TreeNode) else (iid,))
+        )
 
         self.search_entry = ttk.Entry(
             master=self.widget_frame,
@@ -1185,16 +1353,22 @@ class SelectTreeWidget(ttk.Frame):
         self.tree.configure(style="select.Treeview")
 
         if ttk_styler is not None:
-            setattr(self, ".style", {"." + k: v for k, v in ttk_styler(ttk.Style(master)).items()})
+            # the styles are global in the interpreter, apply them once per styler (keep the objects alive on the root)
+            root = self._root()
+            if (applied := getattr(root, ".select_tree_styles", None)) is None:
+                setattr(root, ".select_tree_styles", applied := dict())
+            if (style := applied.get(ttk_styler)) is None:
+                style = applied[ttk_styler] = {"." + k: v for k, v in ttk_styler(ttk.Style(master)).items()}
+            setattr(self, ".style", style)
 
         self.tree.bind("<Button-1>", self.toggle_check, add=True)
-        self.tree.bind("<Double-Button-1>", lambda e: (self.toggle_check(e, _iid) if (_iid := self.tree.iid_path_by_selected()) not in self.tree.all_sector_iids else None))
+        self.tree.bind("<Double-Button-1>", lambda e: (self.toggle_check(e, _iid) if (_iid := self.tree.iid_path_by_selected()) not in self.tree._all_sector_iids_set else None))
         self.tree.bind("<Double-Right>", lambda e: self.tree.toggle_recursive_expand(self.tree.iid_path_by_selected(), True))
         self.tree.bind("<Double-Left>", lambda e: self.tree.toggle_recursive_expand(self.tree.iid_path_by_selected(), False))
         self.tree.bind("+", lambda e: self.tree.toggle_recursive_expand(self.tree.iid_path_by_selected(), True))
         self.tree.bind("-", lambda e: self.tree.toggle_recursive_expand(self.tree.iid_path_by_selected(), False))
-        self.tree.bind("<Return>", lambda e: (self.toggle_check(e, self.tree.iid_path_by_selected()) if e.state == 16 else None))
-        self.tree.bind("<space>", lambda e: (self.toggle_check(e, self.tree.iid_path_by_selected()) if e.state == 16 else None))
+        self.tree.bind("<Return>", lambda e: (self.toggle_check(e, self.tree.iid_path_by_selected()) if not e.state & _STATE_MODIFIERS else None))
+        self.tree.bind("<space>", lambda e: (self.toggle_check(e, self.tree.iid_path_by_selected()) if not e.state & _STATE_MODIFIERS else None))
         self.tree.bind("#", lambda e: self.toggle_check(e, self.tree.iid_path_by_selected()))
 
         self.tree.bind("x", lambda _: self.recursive_expand())
@@ -1229,32 +1403,72 @@ class SelectTreeWidget(ttk.Frame):
         self.tree.grid(row=1, column=0, columnspan=2, sticky=tk.NSEW)
         self.widget_frame.grid(row=1, column=0)
 
+    # heights in pixels of the widgets around the tree (None until Tk has mapped them)
+    _confirm_frame_height: int | None = None
+    _search_entry_height: int | None = None
+
     def resize(self, height: int, width: int) -> bool:
         """Return whether Tk is ready for sizing."""
         if self.confirm_frame:
-            confirm_frame_geo = self.confirm_frame.winfo_geometry()
-            if confirm_frame_geo.startswith("1x1"):
-                return False
-            height -= int(confirm_frame_geo.split("+")[0].split("x")[1]) // 10
+            if self._confirm_frame_height is None:
+                confirm_frame_geo = self.confirm_frame.winfo_geometry()
+                if confirm_frame_geo.startswith("1x1"):
+                    return False
+                self._confirm_frame_height = int(confirm_frame_geo.split("+")[0].split("x")[1])
+            height -= self._confirm_frame_height // 10
             self.cancel_button.configure(width=width // 2 - 1)
             self.confirm_button.configure(width=width // 2 - 1)
 
-        self.search_entry.configure(width=width - 2)
+        self.tk.call(self.search_entry._w, "configure", "-width", width - 2)
         self.tree.set_width(width)
-        entry_height = int(self.search_entry.winfo_geometry().split("x")[1].split("+")[0])
-        self.tree.configure(height=height - entry_height)
+        if (entry_height := self._search_entry_height) is None:
+            entry_geo = self.search_entry.winfo_geometry()
+            entry_height = int(entry_geo.split("x")[1].split("+")[0])
+            if not entry_geo.startswith("1x1"):
+                self._search_entry_height = entry_height
+        self.tk.call(self.tree._w, "configure", "-height", height - entry_height)
         return True
 
+    def invalidate_geometry_cache(self):
+        """Measure the heights of the confirm frame and the search entry again at the next :meth:`resize` (e.g. after style changes)."""
+        self._confirm_frame_height = self._search_entry_height = None
+
     def toggle_check(self, event, iid=None):
         ...
 
+    # mode -> (single check, only sectors (True) / only entries (False) / both (None))
+    _check_modes: dict[str, tuple[bool, bool | None]] = {
+        "multi": (False, None),
+        "single": (True, None),
+        "single entry": (True, False),
+        "single sector": (True, True),
+    }
+
+    def _check(self, e, iid=None, *, single: bool, sectors: bool | None):
+        if not iid and (iid := self.tree.identify_image_row(e)) is None:
+            return
+        if sectors is None or (iid in self.tree._all_sector_iids_set) == sectors:
+            if single:
+                self.tree.toggle_single_check(iid_path=iid)
+            else:
+                self.tree.toggle_check(iid_path=iid)
+
+    _last_search: tuple[str, Pattern] | None = None
+
     def search(self):
         pattern = self.search_entry.get()
         if pattern:
-            try:
-                pattern = compile(pattern, IGNORECASE)
-            except ReError:
-                pattern = compile(escape(pattern), IGNORECASE)
+            if self._last_search is not None and self._last_search[0] == pattern:
+                pattern = self._last_search[1]
+            else:
+                string = pattern
+                pattern = _re2_compile(string)
+                if pattern is None:
+                    try:
+                        pattern = compile(string, IGNORECASE)
+                    except ReError:
+                        pattern = compile(escape(string), IGNORECASE)
+                self._last_search = (string, pattern)
             if self.tree.search(pattern):
                 self.tree.toggle_recursive_expand(expand=False)
         else:
@@ -1262,6 +1476,7 @@ class SelectTreeWidget(ttk.Frame):
 
     def delete_search(self):
         self.search_entry.delete(0, "end")
+        self._last_search = None
         self.tree.remove_match_tags()
 
     def recursive_expand(self):
@@ -1271,29 +1486,31 @@ class SelectTreeWidget(ttk.Frame):
             self.expand_button.configure(text="ᐅ")
 
     def dump(self):
-        if f := asksaveasfile(defaultextension=".json", filetypes=(("json", "*.json"),), initialdir=environ.get("HOME"), title="[dump] Tree Select"):
+        if f := asksaveasfile(mode="wb", defaultextension=".json", filetypes=(("json", "*.json"),), initialdir=environ.get("HOME"), title="[dump] Tree Select"):
             with f:
-                json.dump(self.tree.dump(), f)
+                f.write(_json_dumps(self.tree.dump().as_dict()))
 
     def load(self):
-        if f := askopenfile(defaultextension=".json", filetypes=(("json", "*.json"),), initialdir=environ.get("HOME"), title="[load] Tree Select"):
+        if f := askopenfile(mode="rb", defaultextension=".json", filetypes=(("json", "*.json"),), initialdir=environ.get("HOME"), title="[load] Tree Select"):
             with f:
-                self.tree.load(tuple(TreeNode.from_dict(d) for d in TreeNode.from_dict(json.load(f))))
+                self.tree.load(TreeNode.from_dict(_json_loads(f.read())).children)
 
-    _match_end__reverse_mode = [False, False]
+    # whether the last next_match reached the end of the matches, and in which direction
+    _match_end: bool = False
+    _match_end_reverse: bool = False
 
     def next_match(
             self, reverse: bool
     ):
-        if to_begin := (self._match_end__reverse_mode[0] and reverse == self._match_end__reverse_mode[1]):
-            self._match_end__reverse_mode[0] = False
+        if to_begin := (self._match_end and reverse == self._match_end_reverse):
+            self._match_end = False
         if m := self.tree.selection_to_next_match(
                 reverse=reverse,
                 back_to_begin=to_begin,
         ):
             self.tree.expand_for_match()
             self.tree.focus_set()
-        self._match_end__reverse_mode[0], self._match_end__reverse_mode[1] = m is None, reverse
+        self._match_end, self._match_end_reverse = m is None, reverse
 
     _help_root: tk.Toplevel | None = None
 
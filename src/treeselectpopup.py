@@ -113,7 +113,7 @@ def treepopup(
         window_title: str = "Tree Select Popup",
         window_height: int = 70,
         window_width: int = 50,
-        server_address: tuple[str, int] | Iterable[tuple[str, int]] = ("127.0.0.11", 50_000),
+        server_address: tuple[str, int] | Iterable[tuple[str, int]] | str = "socketpair",
         server_daemon: bool = True,
         return_mode: Literal[
             "receiver",
@@ -171,6 +171,8 @@ def treepopup(
         address=server_address,
         process_daemon=server_daemon,
         instand_return=return_mode in ("wait value", "instand value", "value at action"),
+        pickle=True,
+        prepickle=(None,),
     )
     def func(server: TkBgServer, window_width=window_width, window_height=window_height):
 
@@ -200,7 +202,14 @@ def treepopup(
         )
         widget.pack()
 
-        def sizing(e):
+        sizing_pending = sized = False
+
+        def sizing():
+            nonlocal sizing_pending, sized
+            sizing_pending = False
+            if sized:
+                return
+
             if return_mode == "instand value":
                 return confirm(None)
 
@@ -215,9 +224,17 @@ def treepopup(
                 widget.tree.focus_set()
                 widget.tree.focus(children[0])
 
+            sized = True
             root.unbind("<Configure>", sizing_b)
 
-        sizing_b = root.bind("<Configure>", sizing)
+        def sizing_at_idle(e):
+            # coalesce the <Configure> bursts
+            nonlocal sizing_pending
+            if not sizing_pending:
+                sizing_pending = True
+                root.after_idle(sizing)
+
+        sizing_b = root.bind("<Configure>", sizing_at_idle)
 
         def close(e):
             server.send(None)
@@ -258,13 +275,28 @@ def treepopup(
             widget.tree.bind("<Double-Button-1>", confirm, add=True)
             widget.tree.bind("#", confirm, add=True)
 
-        root.bind("<F2>", lambda _: widget.resize(40, 100))
-        # root.bind("<F3>", lambda _: widget.resize(40, 200))
-        root.bind("<F4>", lambda _: widget.resize(60, 100))
-        root.bind("<F5>", lambda _: widget.resize(60, 200))
-        root.bind("<F6>", lambda _: widget.resize(75, 100))
-        root.bind("<F7>", lambda _: widget.resize(75, 200))
-        root.bind("<F8>", lambda _: widget.resize(70, 50))
+        resize_pending = None
+
+        def resize():
+            nonlocal resize_pending
+            height, width = resize_pending
+            resize_pending = None
+            widget.resize(height, width)
+
+        def resize_at_idle(height, width):
+            # only the last size of repeated key presses is applied
+            nonlocal resize_pending
+            if resize_pending is None:
+                root.after_idle(resize)
+            resize_pending = (height, width)
+
+        root.bind("<F2>", lambda _: resize_at_idle(40, 100))
+        # root.bind("<F3>", lambda _: resize_at_idle(40, 200))
+        root.bind("<F4>", lambda _: resize_at_idle(60, 100))
+        root.bind("<F5>", lambda _: resize_at_idle(60, 200))
+        root.bind("<F6>", lambda _: resize_at_idle(75, 100))
+        root.bind("<F7>", lambda _: resize_at_idle(75, 200))
+        root.bind("<F8>", lambda _: resize_at_idle(70, 50))
 
         return root
 